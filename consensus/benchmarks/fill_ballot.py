@@ -0,0 +1,69 @@
+"""
+Benchmarks filling a ballot (weighted sampling without replacement).
+
+Run from the consensus directory:
+
+    python -m benchmarks.fill_ballot
+
+Compares weighted_shuffle with the previous implementation, which drew one element at
+a time with random.choices, and checks that both put each member first equally often.
+"""
+import random
+import time
+from collections import Counter
+from typing import List
+
+from pkg.engine.voting_system import weighted_shuffle
+
+MEMBER_COUNTS = [8, 16, 32, 64, 128, 256, 512]
+REPETITIONS = 20
+DISTRIBUTION_SAMPLES = 20000
+
+
+def repeated_choices(population: List[str], weights: List[float]) -> List[str]:
+    population = population.copy()
+    weights = weights.copy()
+    ballot = []
+    while len(population):
+        candidate = random.choices(population, weights=weights, k=1)[0]
+        ballot.append(candidate)
+        idx = population.index(candidate)
+        population.pop(idx)
+        weights.pop(idx)
+    return ballot
+
+
+def timed(fn, population, weights) -> float:
+    start = time.perf_counter()
+    for _ in range(REPETITIONS):
+        fn(population, weights)
+    return (time.perf_counter() - start) / REPETITIONS
+
+
+def first_place_frequencies(fn, population, weights) -> Counter:
+    return Counter(fn(population, weights)[0] for _ in range(DISTRIBUTION_SAMPLES))
+
+
+def main():
+    print(f"{'members':>8} {'shuffle (ms)':>13} {'choices (ms)':>13}")
+    for members in MEMBER_COUNTS:
+        population = [f"{i:066x}" for i in range(members)]
+        weights = [random.choice([1.0, 0.75, 0.5, 0.001]) for _ in population]
+        new = timed(weighted_shuffle, population, weights)
+        old = timed(repeated_choices, population, weights)
+        print(f"{members:>8} {1000 * new:>13.3f} {1000 * old:>13.3f}")
+
+    population = [f"{i:066x}" for i in range(4)]
+    weights = [1.0, 0.5, 0.25, 0.001]
+    new = first_place_frequencies(weighted_shuffle, population, weights)
+    old = first_place_frequencies(repeated_choices, population, weights)
+    print("\nFirst place frequency (weights %s):" % weights)
+    for key, weight in zip(population, weights):
+        print(
+            f"  {weight:>6}: shuffle {new[key] / DISTRIBUTION_SAMPLES:.3f}"
+            f"  choices {old[key] / DISTRIBUTION_SAMPLES:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
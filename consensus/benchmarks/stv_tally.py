@@ -0,0 +1,88 @@
+"""
+Benchmarks the STV tally used to compute epoch results.
+
+Run from the consensus directory:
+
+    python -m benchmarks.stv_tally
+
+If STVPoll is installed, the previous ScottishSTV-based computation is timed as well,
+and the results of the two are compared for elections where ScottishSTV did not need
+the random tie-break.
+"""
+import random
+import time
+from typing import List
+
+from pkg.engine.stv import STVTally
+from pkg.engine.utils import hash_int
+
+try:
+    from stvpoll.scottish_stv import ScottishSTV
+except ImportError:
+    ScottishSTV = None
+
+MEMBER_COUNTS = [8, 16, 32, 64, 128, 256]
+REPETITIONS = 5
+
+
+def make_ballots(keys: List[str], rng: random.Random) -> List[List[str]]:
+    """One ballot per member, weighted towards the first keys like real scores."""
+    weights = [1 / (i + 1) for i in range(len(keys))]
+    ballots = []
+    for _ in keys:
+        ranking = sorted(keys, key=lambda k: -rng.random() * weights[keys.index(k)])
+        ballots.append(ranking)
+    return ballots
+
+
+def tally(keys: List[str], ballots: List[List[str]], epoch: int) -> List[str]:
+    indices = {k: i for i, k in enumerate(keys)}
+    stv = STVTally(len(keys), priorities=[hash_int(k, epoch) for k in keys])
+    for ballot in ballots:
+        stv.add_ballot(indices[k] for k in ballot)
+    return [keys[i] for i in stv.calculate()]
+
+
+def scottish_stv(keys: List[str], ballots: List[List[str]]):
+    poll = ScottishSTV(
+        seats=len(keys), candidates=tuple(keys), random_in_tiebreaks=False
+    )
+    for ballot in ballots:
+        poll.add_ballot(ballot)
+    return poll.calculate().elected_as_tuple()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return time.perf_counter() - start, value
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'members':>8} {'tally (ms)':>12} {'stvpoll (ms)':>14} {'compared':>9} {'equal':>6}")
+    for members in MEMBER_COUNTS:
+        keys = [f"{hash_int('member', i):064x}" for i in range(members)]
+        native = reference = 0.0
+        compared = equal = 0
+        for epoch in range(REPETITIONS):
+            ballots = make_ballots(keys, rng)
+            elapsed, result = timed(tally, keys, ballots, epoch)
+            native += elapsed
+            if ScottishSTV is None:
+                continue
+            elapsed, expected = timed(scottish_stv, keys, ballots)
+            reference += elapsed
+            if len(expected) == members:
+                compared += 1
+                equal += tuple(result) == expected
+
+        reference_ms = f"{1000 * reference / REPETITIONS:.2f}" if ScottishSTV else "-"
+        print(
+            f"{members:>8} {1000 * native / REPETITIONS:>12.2f} {reference_ms:>14} "
+            f"{compared:>9} {equal:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
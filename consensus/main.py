@@ -5,12 +5,13 @@ import sys
 import pkg_resources
 
 from sawtooth_sdk.consensus.zmq_driver import ZmqDriver
-from sawtooth_sdk.processor.exceptions import LocalConfigurationError
 from sawtooth_sdk.processor.log import log_configuration
 from sawtooth_sdk.processor.log import init_console_logging
 from sawtooth_sdk.processor.config import get_log_dir
 
+from pkg.config.exceptions import LocalConfigurationError
 from pkg.config.path import load_path_config
+from pkg.config.rpc import COMPRESSION_ALGORITHMS, RpcConfig, load_rpc_config
 from pkg.engine.ddpoa_engine import DDPoAEngine
 
 DISTRIBUTION_NAME = "sawtooth-ddpoa-consensus-engine"
@@ -32,6 +33,37 @@ def parse_args(args):
         default='tcp://localhost:4004',
         help='Endpoint for the validator component connection')
 
+    parser.add_argument(
+        '--rpc-bind',
+        help='Address the consensus RPC server binds to (default [::]:50051)\n'
+             'The port is also used to connect to the other members')
+
+    parser.add_argument(
+        '--rpc-workers',
+        type=int,
+        help='Number of RPC server worker threads (default: number of members + 2)')
+
+    parser.add_argument(
+        '--rpc-max-concurrent-streams',
+        type=int,
+        help='Maximum number of concurrent streams per RPC connection')
+
+    parser.add_argument(
+        '--rpc-max-message-size',
+        type=int,
+        help='Maximum size in bytes of a message sent or received over RPC')
+
+    parser.add_argument(
+        '--rpc-compression',
+        choices=COMPRESSION_ALGORITHMS,
+        help='Compression of RPC messages (default none)')
+
+    parser.add_argument(
+        '--rpc-aio',
+        action='store_true',
+        default=None,
+        help='Serve the consensus RPCs with the grpc.aio server')
+
     parser.add_argument('-v', '--verbose',
                         action='count',
                         default=0,
@@ -63,6 +95,20 @@ def main(args=None):
         args = sys.argv[1:]
     opts = parse_args(args)
 
+    try:
+        rpc_config = load_rpc_config(
+            path_config.config_dir,
+            RpcConfig(
+                bind=opts.rpc_bind,
+                workers=opts.rpc_workers,
+                max_concurrent_streams=opts.rpc_max_concurrent_streams,
+                max_message_size=opts.rpc_max_message_size,
+                compression=opts.rpc_compression,
+                aio=opts.rpc_aio))
+    except LocalConfigurationError as local_config_err:
+        LOGGER.error(str(local_config_err))
+        sys.exit(1)
+
     try:
         log_dir = get_log_dir()
         log_configuration(
@@ -74,7 +120,8 @@ def main(args=None):
         driver = ZmqDriver(
             DDPoAEngine(
                 path_config=path_config,
-                component_endpoint=opts.component
+                component_endpoint=opts.component,
+                rpc_config=rpc_config
                ))
 
         LOGGER.info(msg="Starting DDPoA Consensus Engine Driver")
@@ -0,0 +1,155 @@
+import collections
+import logging
+import os
+
+import toml
+
+from .exceptions import LocalConfigurationError
+
+LOGGER = logging.getLogger(__name__)
+
+COMPRESSION_ALGORITHMS = ('none', 'gzip', 'deflate')
+
+# Settings that may be given on-chain (sawtooth.consensus.ddpoa.rpc_<name>), so that
+# a whole network can be tuned at once. The bind address and server type are local.
+ON_CHAIN_SETTINGS = (
+    'workers', 'max_concurrent_streams', 'max_message_size', 'compression')
+
+
+def get_default_rpc_config():
+    """Returns the default RpcConfig. Workers default to one per peer stream (see
+    Communicator.server), message sizes and streams to the gRPC defaults.
+    """
+    return RpcConfig(bind='[::]:50051', compression='none', aio=False)
+
+
+def load_toml_rpc_config(filename):
+    """Returns a RpcConfig created by loading a TOML file from the
+    filesystem.
+    """
+    if not os.path.exists(filename):
+        LOGGER.info(
+            "Skipping rpc loading from non-existent config file: %s",
+            filename)
+        return RpcConfig()
+
+    LOGGER.info("Loading rpc configuration from config: %s", filename)
+
+    try:
+        with open(filename) as fd:
+            raw_config = fd.read()
+    except IOError as e:
+        raise LocalConfigurationError(
+            "Unable to load rpc configuration file: {}".format(str(e))) from e
+
+    toml_config = toml.loads(raw_config)
+
+    invalid_keys = set(toml_config.keys()).difference(
+        ['bind', 'workers', 'max_concurrent_streams', 'max_message_size',
+         'compression', 'aio'])
+    if invalid_keys:
+        raise LocalConfigurationError("Invalid keys in rpc config: {}".format(
+            ", ".join(sorted(list(invalid_keys)))))
+
+    return RpcConfig(**toml_config)
+
+
+def load_on_chain_rpc_config(settings):
+    """Returns a RpcConfig from the on-chain settings (see ON_CHAIN_SETTINGS)."""
+    return RpcConfig(**{
+        name: settings.get('sawtooth.consensus.ddpoa.rpc_' + name) or None
+        for name in ON_CHAIN_SETTINGS
+    })
+
+
+def merge_rpc_config(configs):
+    """
+    Given a list of RpcConfig objects, merges them into a single RpcConfig,
+    giving priority in the order of the configs (first has highest priority).
+    """
+    merged = collections.OrderedDict()
+    for config in reversed(configs):
+        for name, value in config.to_dict().items():
+            if value is not None:
+                merged[name] = value
+
+    return RpcConfig(**merged)
+
+
+def load_rpc_config(config_dir, overrides=None):
+    """Loads the local rpc configuration: the overrides (e.g. from the command line) on
+    top of ddpoa.toml in the config dir. The engine merges it with the on-chain settings
+    and the defaults once it has started.
+    """
+    toml_config = load_toml_rpc_config(os.path.join(config_dir, 'ddpoa.toml'))
+
+    return merge_rpc_config(configs=[overrides or RpcConfig(), toml_config])
+
+
+class RpcConfig:
+    """Configuration of the gRPC server (and channels) used between the engines.
+    Unset values are None.
+    """
+
+    def __init__(self, bind=None, workers=None, max_concurrent_streams=None,
+                 max_message_size=None, compression=None, aio=None):
+
+        if compression is not None and compression not in COMPRESSION_ALGORITHMS:
+            raise LocalConfigurationError(
+                "Invalid rpc compression: {} (expected one of {})".format(
+                    compression, ", ".join(COMPRESSION_ALGORITHMS)))
+
+        self._bind = bind
+        self._workers = _optional_int(workers)
+        self._max_concurrent_streams = _optional_int(max_concurrent_streams)
+        self._max_message_size = _optional_int(max_message_size)
+        self._compression = compression
+        self._aio = aio
+
+    @property
+    def bind(self):
+        return self._bind
+
+    @property
+    def port(self):
+        """Port of the bind address, which peers are dialed on as well."""
+        return int(self._bind.rsplit(':', 1)[1])
+
+    @property
+    def workers(self):
+        return self._workers
+
+    @property
+    def max_concurrent_streams(self):
+        return self._max_concurrent_streams
+
+    @property
+    def max_message_size(self):
+        return self._max_message_size
+
+    @property
+    def compression(self):
+        return self._compression
+
+    @property
+    def aio(self):
+        return self._aio
+
+    def __repr__(self):
+        return "{}({})".format(
+            self.__class__.__name__,
+            ", ".join("{}={}".format(k, repr(v)) for k, v in self.to_dict().items()))
+
+    def to_dict(self):
+        return collections.OrderedDict([
+            ('bind', self._bind),
+            ('workers', self._workers),
+            ('max_concurrent_streams', self._max_concurrent_streams),
+            ('max_message_size', self._max_message_size),
+            ('compression', self._compression),
+            ('aio', self._aio)
+        ])
+
+
+def _optional_int(value):
+    return int(value) if value is not None else None
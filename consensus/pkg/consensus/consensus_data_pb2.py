@@ -13,13 +13,13 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14\x63onsensus_data.proto\x12\x0esawtooth_ddpoa\"\x7f\n\rConsensusData\x12\x11\n\ttimestamp\x18\x01 \x01(\r\x12\r\n\x05\x65poch\x18\x02 \x01(\r\x12\x12\n\nwitnessIdx\x18\x03 \x01(\r\x12\x12\n\ncandidates\x18\x04 \x03(\t\x12\x11\n\tconsensus\x18\x05 \x01(\t\x12\x11\n\tnum_slots\x18\x06 \x01(\rb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14\x63onsensus_data.proto\x12\x0esawtooth_ddpoa\"\x9a\x01\n\rConsensusData\x12\x11\n\ttimestamp\x18\x01 \x01(\r\x12\r\n\x05\x65poch\x18\x02 \x01(\r\x12\x12\n\nwitnessIdx\x18\x03 \x01(\r\x12\x12\n\ncandidates\x18\x04 \x03(\t\x12\x11\n\tconsensus\x18\x05 \x01(\t\x12\x11\n\tnum_slots\x18\x06 \x01(\r\x12\x19\n\x11packed_candidates\x18\x07 \x01(\x0c\x62\x06proto3')
 
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'consensus_data_pb2', globals())
 if _descriptor._USE_C_DESCRIPTORS == False:
 
   DESCRIPTOR._options = None
-  _CONSENSUSDATA._serialized_start=40
-  _CONSENSUSDATA._serialized_end=167
+  _CONSENSUSDATA._serialized_start=41
+  _CONSENSUSDATA._serialized_end=195
 # @@protoc_insertion_point(module_scope)
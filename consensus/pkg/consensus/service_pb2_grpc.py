@@ -24,6 +24,11 @@ class ConsensusRPCStub(object):
                 request_serializer=service__pb2.ConsensusMessage.SerializeToString,
                 response_deserializer=service__pb2.Empty.FromString,
                 )
+        self.Stream = channel.stream_stream(
+                '/sawtooth_ddpoa.ConsensusRPC/Stream',
+                request_serializer=service__pb2.ConsensusMessage.SerializeToString,
+                response_deserializer=service__pb2.ConsensusMessage.FromString,
+                )
 
 
 class ConsensusRPCServicer(object):
@@ -41,6 +46,13 @@ class ConsensusRPCServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def Stream(self, request_iterator, context):
+        """Long-lived stream carrying all consensus messages (and heartbeats) from one peer
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ConsensusRPCServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -54,6 +66,11 @@ def add_ConsensusRPCServicer_to_server(servicer, server):
                     request_deserializer=service__pb2.ConsensusMessage.FromString,
                     response_serializer=service__pb2.Empty.SerializeToString,
             ),
+            'Stream': grpc.stream_stream_rpc_method_handler(
+                    servicer.Stream,
+                    request_deserializer=service__pb2.ConsensusMessage.FromString,
+                    response_serializer=service__pb2.ConsensusMessage.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'sawtooth_ddpoa.ConsensusRPC', rpc_method_handlers)
@@ -97,3 +114,20 @@ class ConsensusRPC(object):
             service__pb2.Empty.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Stream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/sawtooth_ddpoa.ConsensusRPC/Stream',
+            service__pb2.ConsensusMessage.SerializeToString,
+            service__pb2.ConsensusMessage.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,392 @@
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sawtooth_sdk.consensus.service import Block
+
+from .config import ANCESTOR_CACHE_SIZE, BLOCK_CACHE_SIZE
+from ..consensus.consensus_data_pb2 import ConsensusData  # type: ignore
+
+
+class ConsensusView(NamedTuple):
+    """Immutable, parsed view of the ConsensusData payload of a block."""
+
+    timestamp: int
+    epoch: int
+    witness_idx: int
+    num_slots: int
+    packed_candidates: bytes
+    candidates: Tuple[str, ...]  # Only set in blocks created before packed_candidates
+    consensus: str
+
+    @classmethod
+    def parse(cls, payload: bytes) -> "ConsensusView":
+        data = ConsensusData()
+        data.ParseFromString(payload)
+        return cls(
+            timestamp=data.timestamp,
+            epoch=data.epoch,
+            witness_idx=data.witnessIdx,
+            num_slots=data.num_slots,
+            packed_candidates=data.packed_candidates,
+            candidates=tuple(data.candidates),
+            consensus=data.consensus,
+        )
+
+
+class BlockTree:
+    """
+    Parent/child links between cached blocks with binary-lifting jump tables, so that
+    ancestor and common-ancestor queries take O(log n) hops. Jump tables are built once,
+    when a block (or an ancestor that arrived late) is added, and are not rebuilt when
+    blocks are evicted: entries may point at evicted blocks, and lookups stop when they
+    reach one. Common-ancestor queries are memoized until the tree changes.
+    """
+
+    def __init__(self):
+        self._parent: Dict[bytes, bytes] = {}
+        self._depth: Dict[bytes, int] = {}
+        self._jumps: Dict[bytes, List[bytes]] = {}  # jumps[i] is the ancestor 2^i levels up
+        self._children: Dict[bytes, Set[bytes]] = {}
+        self._lca_memo: Dict[Tuple[bytes, bytes], Optional[bytes]] = {}
+
+    def __contains__(self, block_id) -> bool:
+        return block_id in self._depth
+
+    def add(self, block_id: bytes, parent_id: bytes, depth: int):
+        self._parent[block_id] = parent_id
+        self._depth[block_id] = depth
+        self._children.setdefault(parent_id, set()).add(block_id)
+        self._link(block_id)
+        # Children that arrived before this block can now reach further up
+        pending = list(self._children.get(block_id, ()))
+        while pending:
+            cur = pending.pop()
+            self._link(cur)
+            pending.extend(self._children.get(cur, ()))
+        self._lca_memo.clear()
+
+    def remove(self, block_id: bytes):
+        parent_id = self._parent.pop(block_id)
+        del self._depth[block_id]
+        del self._jumps[block_id]
+        siblings = self._children[parent_id]
+        siblings.discard(block_id)
+        if not siblings:
+            del self._children[parent_id]
+        self._lca_memo.clear()
+
+    def _link(self, block_id: bytes):
+        """Builds the jump table of a block from the tables of its ancestors."""
+        jumps = []
+        if (parent_id := self._parent[block_id]) in self._depth:
+            jumps.append(parent_id)
+            while (table := self._jumps.get(jumps[-1])) is not None and len(jumps) <= len(table):
+                jumps.append(table[len(jumps) - 1])
+        self._jumps[block_id] = jumps
+
+    def depth(self, block_id: bytes) -> int:
+        return self._depth[block_id]
+
+    def ancestor(self, block_id: bytes, depth: int) -> Optional[bytes]:
+        """Returns the cached ancestor (or the block itself) at the given depth."""
+        if block_id not in self._depth or depth > self._depth[block_id]:
+            return None
+        distance = self._depth[block_id] - depth
+        level = 0
+        while distance:
+            if distance & 1:
+                jumps = self._jumps.get(block_id)
+                if jumps is None or level >= len(jumps):
+                    return None
+                block_id = jumps[level]
+            distance >>= 1
+            level += 1
+        return block_id if block_id in self._depth else None
+
+    def oldest_ancestor(self, block_id: bytes) -> bytes:
+        """Returns the oldest cached ancestor that can be reached from the block."""
+        while True:
+            jumps = self._jumps[block_id]
+            reachable = [j for j in jumps if j in self._depth]
+            if not reachable:
+                return block_id
+            block_id = reachable[-1]
+
+    def common_ancestor(self, a: bytes, b: bytes) -> Optional[bytes]:
+        """Returns the newest cached block that both blocks descend from (or are)."""
+        key = (a, b) if a <= b else (b, a)
+        if key not in self._lca_memo:
+            self._lca_memo[key] = self._common_ancestor(a, b)
+        return self._lca_memo[key]
+
+    def _common_ancestor(self, a: bytes, b: bytes) -> Optional[bytes]:
+        if a not in self._depth or b not in self._depth:
+            return None
+        depth = min(self._depth[a], self._depth[b])
+        a, b = self.ancestor(a, depth), self.ancestor(b, depth)  # type: ignore
+        if a is None or b is None:
+            return None
+        if a == b:
+            return a
+
+        for level in reversed(range(min(len(self._jumps[a]), len(self._jumps[b])))):
+            jumps_a, jumps_b = self._jumps[a], self._jumps[b]
+            if level >= len(jumps_a) or level >= len(jumps_b):
+                continue
+            up_a, up_b = jumps_a[level], jumps_b[level]
+            if up_a != up_b and up_a in self._depth and up_b in self._depth:
+                a, b = up_a, up_b
+
+        parent = self._parent[a]
+        if parent == self._parent[b] and parent in self._depth:
+            return parent
+        return None
+
+
+class BlockCache:
+    """
+    Keeps the most recently received blocks, indexed by id, by block number, by
+    (block number, signer) and by parent, so every lookup is constant time.
+
+    When the cache is full a block is evicted (and ignored by the validator). Blocks at or
+    below the committed head that are not pinned (stale forks and old ancestors) go first,
+    in the order they became stale, then the oldest unpinned block. Both are kept in their
+    own ordered sets, so a block to evict is found in constant time. Pinned blocks, i.e.
+    the chain towards a fast-forward target, are never evicted, so the cache may
+    temporarily grow beyond its size.
+
+    Blocks that are not cached are fetched from the validator in batches (see get_blocks)
+    and remembered separately, without affecting what the cache ignores.
+
+    The consensus data of a block is parsed once, on first use, and kept by block id.
+    """
+
+    def __init__(self, service, size: int = BLOCK_CACHE_SIZE):
+        self._service = service
+        self._size = size
+        self._cache: "OrderedDict[bytes, Block]" = OrderedDict()
+        self._signers: Dict[bytes, str] = {}
+        self._by_num: Dict[int, Dict[bytes, Block]] = {}
+        self._by_num_and_signer: Dict[Tuple[int, str], Block] = {}
+        self._tree = BlockTree()
+        self._pinned: Set[bytes] = set()
+        # Eviction order: unpinned blocks at or below the head, and all unpinned blocks
+        self._stale: "OrderedDict[bytes, None]" = OrderedDict()
+        self._unpinned: "OrderedDict[bytes, None]" = OrderedDict()
+        self._head: Tuple[Optional[bytes], int] = (None, -1)
+        self._fetched: "OrderedDict[bytes, Block]" = OrderedDict()
+        self._consensus: "OrderedDict[bytes, ConsensusView]" = OrderedDict()
+
+    def append(self, block: Block):
+        if block.block_id in self._cache:
+            self._cache.move_to_end(block.block_id)
+            if block.block_id in self._unpinned:
+                self._unpinned.move_to_end(block.block_id)
+            return
+
+        signer = block.signer_id.hex()
+        self._cache[block.block_id] = block
+        self._signers[block.block_id] = signer
+        self._by_num.setdefault(block.block_num, {})[block.block_id] = block
+        self._by_num_and_signer.setdefault((block.block_num, signer), block)
+        self._tree.add(block.block_id, block.previous_id, block.block_num)
+        self._unpinned[block.block_id] = None
+        if self._is_stale(block):
+            self._stale[block.block_id] = None
+
+        self._evict()
+
+    def set_head(self, block_id: bytes, block_num: int):
+        """Tells the cache which block was committed last."""
+        old_num = self._head[1]
+        self._head = (block_id, block_num)
+        if block_num < old_num:
+            self._reset_eviction_order()  # Blocks above the new head are no longer stale
+            return
+
+        # Blocks from the old head's number up to the new head's may have become stale
+        if block_num - old_num < len(self._by_num):
+            nums = range(max(old_num, 0), block_num + 1)
+        else:
+            nums = sorted(n for n in self._by_num if old_num <= n <= block_num)
+        for num in nums:
+            for block in self._by_num.get(num, {}).values():
+                if block.block_id in self._unpinned and self._is_stale(block):
+                    self._stale[block.block_id] = None
+        self._stale.pop(block_id, None)  # Stale before, if it was a fork at the old head
+
+    def _is_stale(self, block: Block) -> bool:
+        head_id, head_num = self._head
+        return block.block_num < head_num or (
+            block.block_num == head_num and block.block_id != head_id
+        )
+
+    def _reset_eviction_order(self):
+        self._unpinned = OrderedDict(
+            (block_id, None) for block_id in self._cache if block_id not in self._pinned
+        )
+        self._stale = OrderedDict(
+            (block_id, None)
+            for block_id in self._unpinned
+            if self._is_stale(self._cache[block_id])
+        )
+
+    def pin_chain(self, from_id: bytes, to_id: bytes):
+        """
+        Pins the cached chain from from_id back to (and including) to_id, or to the
+        oldest cached ancestor if to_id is not on the chain.
+        """
+        prev: bytes = from_id
+        while curr := self._cache.get(prev, None):
+            self._pinned.add(curr.block_id)
+            self._unpinned.pop(curr.block_id, None)
+            self._stale.pop(curr.block_id, None)
+            if curr.block_id == to_id:
+                return
+            prev = curr.previous_id
+
+    def unpin(self):
+        self._pinned.clear()
+        self._reset_eviction_order()
+        self._evict()
+
+    def _evict(self):
+        while len(self._cache) > self._size:
+            if (id_to_pop := self._eviction_candidate()) is None:
+                return
+            self._unindex(self._cache.pop(id_to_pop))
+            self._service.ignore_block(id_to_pop)
+
+    def _eviction_candidate(self) -> Optional[bytes]:
+        for candidates in (self._stale, self._unpinned):
+            if candidates:
+                return next(iter(candidates))
+        return None  # Everything is pinned
+
+    def _unindex(self, block: Block):
+        block_id = block.block_id
+        del self._by_num[block.block_num][block_id]
+        signer = self._signers.pop(block_id)
+        if not self._by_num[block.block_num]:
+            del self._by_num[block.block_num]
+
+        key = (block.block_num, signer)
+        if self._by_num_and_signer.get(key) is block:
+            del self._by_num_and_signer[key]
+            # Another block for the same slot and signer may still be cached
+            for other in self._by_num.get(block.block_num, {}).values():
+                if self._signers[other.block_id] == signer:
+                    self._by_num_and_signer[key] = other
+                    break
+
+        self._pinned.discard(block_id)
+        self._unpinned.pop(block_id, None)
+        self._stale.pop(block_id, None)
+        self._tree.remove(block_id)
+        self._consensus.pop(block_id, None)
+
+    def block_from_id(self, block_id) -> Block:
+        return self._cache.get(block_id, None)  # type: ignore
+
+    def get_blocks(self, block_ids: List[bytes]) -> Dict[bytes, Block]:
+        """
+        Returns the requested blocks. Cached and previously fetched blocks are used
+        directly and the rest are fetched from the validator in a single call.
+        """
+        blocks: Dict[bytes, Block] = {}
+        missing = []
+        for block_id in block_ids:
+            if (block := self._cache.get(block_id, self._fetched.get(block_id))) is None:
+                missing.append(block_id)
+            else:
+                blocks[block_id] = block
+
+        if missing:
+            for block_id, block in self._service.get_blocks(missing).items():
+                blocks[block_id] = block
+                self._fetched[block_id] = block
+                if len(self._fetched) > ANCESTOR_CACHE_SIZE:
+                    self._fetched.popitem(last=False)
+        return blocks
+
+    def get_block(self, block_id: bytes) -> Block:
+        return self.get_blocks([block_id])[block_id]
+
+    def consensus(self, block: Block) -> ConsensusView:
+        """Returns the parsed consensus data of a block (the payload is decoded once)."""
+        if (view := self._consensus.get(block.block_id)) is None:
+            view = ConsensusView.parse(block.payload)
+            self._consensus[block.block_id] = view
+            if len(self._consensus) > self._size + ANCESTOR_CACHE_SIZE:
+                self._consensus.popitem(last=False)
+        return view
+
+    def fork_point(self, a: Block, b: Block) -> Tuple[Optional[bytes], Optional[bytes]]:
+        """
+        Walks back from two blocks until their chains meet. Returns the id of the newest
+        block on both chains and the id of the block following it on a's chain (None if
+        a is on b's chain), or (None, None) if the chains do not meet.
+
+        Both chains are walked in lockstep, so each step fetches the missing parents in one
+        batched call, and the walk switches to the block tree as soon as both sides are
+        cached (and the block following the meeting point on a's chain is still cached).
+        There is no limit on how deep the fork is.
+        """
+        child_on_a: Optional[bytes] = None
+        while a.block_id != b.block_id:
+            if a.block_id in self._tree and b.block_id in self._tree:
+                if (common := self._tree.common_ancestor(a.block_id, b.block_id)) is not None:
+                    if common == a.block_id:
+                        return (common, child_on_a)
+                    # The block above common on a's chain may have been evicted
+                    child = self._tree.ancestor(a.block_id, self._tree.depth(common) + 1)
+                    if child is not None:
+                        return (common, child)
+
+            step_a = a.block_num >= b.block_num
+            step_b = b.block_num >= a.block_num
+            if (step_a and a.block_num == 0) or (step_b and b.block_num == 0):
+                return (None, None)  # Reached genesis on different chains
+
+            parents = self.get_blocks(
+                ([a.previous_id] if step_a else []) + ([b.previous_id] if step_b else [])
+            )
+            if step_a:
+                child_on_a = a.block_id
+                a = parents[a.previous_id]
+            if step_b:
+                b = parents[b.previous_id]
+
+        return (a.block_id, child_on_a)
+
+    def block_by_num_and_signer(self, block_num: int, signer: str) -> Optional[Block]:
+        return self._by_num_and_signer.get((block_num, signer))
+
+    def traversable(self, from_id: bytes, to_id: bytes):
+        """
+        Returns True if the cache knows to_id to be an ancestor of from_id (to_id itself
+        does not have to be cached if it is the parent of the oldest reachable ancestor).
+        Evicted blocks in between are not a problem, block_path fetches them.
+        """
+        if from_id not in self._cache:
+            return from_id == to_id
+        if (to_block := self._cache.get(to_id)) is not None:
+            return self._tree.ancestor(from_id, to_block.block_num) == to_id
+        return self._cache[self._tree.oldest_ancestor(from_id)].previous_id == to_id
+
+    def contains(self, block_id: bytes):
+        return block_id in self._cache
+
+    def block_path(self, from_id: bytes, to_id: bytes):
+        """
+        Returns the ids of the blocks after to_id up to (and including) from_id, oldest
+        first. Blocks outside the cache are fetched from the validator.
+        """
+        block_ids = []
+        cur_block = self.get_block(from_id)
+        while cur_block.previous_id != to_id:
+            block_ids.append(cur_block.block_id)
+            cur_block = self.get_block(cur_block.previous_id)
+        block_ids.append(cur_block.block_id)
+        block_ids.reverse()
+        return block_ids
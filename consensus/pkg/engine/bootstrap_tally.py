@@ -0,0 +1,71 @@
+from typing import Dict, Optional, Tuple
+
+
+class BootstrapTally:
+    """
+    Counts the chain heads reported in BOOTSTRAP messages. Each signer's answer supports
+    both its chain head and the head's parent, and only the latest answer per signer is
+    counted. Counts are updated in O(1) per message and the leading head (most support,
+    then highest block number) is kept up to date.
+    """
+
+    def __init__(self):
+        self._answers: Dict[str, Tuple[bytes, bytes]] = {}
+        self._counts: Dict[bytes, int] = {}
+        self._nums: Dict[bytes, int] = {}
+        self._leader: Optional[bytes] = None
+
+    def __len__(self) -> int:
+        """Returns the number of signers that have answered."""
+        return len(self._answers)
+
+    def add(self, signer: str, bootstrap) -> bool:
+        """Records a BOOTSTRAP message. Returns False if it repeats the signer's last answer."""
+        answer = (bootstrap.chain_head_id, bootstrap.pre_id)
+        if (previous := self._answers.get(signer)) == answer:
+            return False
+
+        self._answers[signer] = answer
+        if previous is not None:
+            self._decrement(previous[0])
+            self._decrement(previous[1])
+
+        self._increment(bootstrap.chain_head_id, bootstrap.num_blocks)
+        self._increment(bootstrap.pre_id, bootstrap.num_blocks - 1)
+        return True
+
+    def _increment(self, block_id: bytes, num: int):
+        self._counts[block_id] = self._counts.get(block_id, 0) + 1
+        self._nums.setdefault(block_id, num)
+        if self._leader is None or self._rank(block_id) > self._rank(self._leader):
+            self._leader = block_id
+
+    def _decrement(self, block_id: bytes):
+        self._counts[block_id] -= 1
+        if self._counts[block_id] == 0:
+            del self._counts[block_id]
+            del self._nums[block_id]
+        if block_id == self._leader:
+            # Rare (a signer changed its answer), find the new leader from scratch
+            self._leader = max(self._counts, key=self._rank, default=None)
+
+    def _rank(self, block_id: bytes) -> Tuple[int, int]:
+        return (self._counts[block_id], self._nums[block_id])
+
+    @property
+    def leader(self) -> Optional[Tuple[bytes, int, int]]:
+        """Returns (block id, block number, count) of the leading head, if any."""
+        if self._leader is None:
+            return None
+        return (self._leader, self._nums[self._leader], self._counts[self._leader])
+
+    def clear(self):
+        self._answers.clear()
+        self._counts.clear()
+        self._nums.clear()
+        self._leader = None
+
+    def __str__(self):
+        return ", ".join(
+            f"({b.hex()[:5]}, {self._nums[b]}, {c})" for b, c in self._counts.items()
+        )
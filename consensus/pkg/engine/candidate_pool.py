@@ -0,0 +1,44 @@
+from collections import deque
+from typing import Deque, Iterable, Optional, Tuple
+
+from .types import Key
+
+
+class CandidatePool:
+    """
+    Candidates waiting to replace downgraded witnesses, in FIFO order. Only used from
+    the engine thread, so it is a plain deque without locking. Nothing ever blocks: an
+    empty pool simply has no candidate to offer. Snapshots are cached until the pool
+    changes.
+    """
+
+    def __init__(self, candidates: Iterable[Key] = ()):
+        self._queue: Deque[Key] = deque(candidates)
+        self._snapshot: Optional[Tuple[Key, ...]] = None
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def put(self, candidate: Key):
+        self._queue.append(candidate)
+        self._snapshot = None
+
+    def swap(self, witness: Key) -> Optional[Key]:
+        """
+        Takes the first candidate and puts the witness at the back of the pool.
+        Returns None (and keeps the pool unchanged) if there are no candidates.
+        """
+        if not self._queue:
+            return None
+        candidate = self._queue.popleft()
+        self._queue.append(witness)
+        self._snapshot = None
+        return candidate
+
+    def snapshot(self) -> Tuple[Key, ...]:
+        if self._snapshot is None:
+            self._snapshot = tuple(self._queue)
+        return self._snapshot
+
+    def __str__(self):
+        return str(list(self._queue))
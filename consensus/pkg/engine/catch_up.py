@@ -0,0 +1,118 @@
+import logging
+from collections import deque
+from enum import IntEnum, unique
+from typing import Deque, Dict, List, Set
+
+from .config import CATCH_UP_WINDOW
+
+LOGGER = logging.getLogger(__name__)
+
+
+@unique
+class BlockProgress(IntEnum):
+    PENDING = 0
+    VALIDATING = 1
+    VALID = 2
+    COMMITTING = 3
+
+
+class CatchUpPipeline:
+    """
+    Fast-forwards along a chain of blocks. Up to `window` blocks are in validation at
+    the same time, and validated blocks are committed strictly in chain order, each as
+    soon as its parent has been committed. Progress is tracked per block id.
+
+    Blocks that are still being validated or committed when the catch-up is aborted keep
+    receiving notifications from the validator. Those are recognised as belonging to the
+    catch-up (and otherwise ignored), so they never reach the engine's own bookkeeping.
+    """
+
+    def __init__(self, service, window: int = CATCH_UP_WINDOW):
+        self._service = service
+        self._window = window
+        self._path: Deque[bytes] = deque()
+        self._progress: Dict[bytes, BlockProgress] = {}
+        self._next_to_check = 0  # Index in _path of the next block to submit for validation
+        self._aborted: Set[bytes] = set()  # In flight when aborted, awaiting a notification
+
+    @property
+    def active(self) -> bool:
+        return len(self._path) > 0
+
+    def contains(self, block_id: bytes) -> bool:
+        return block_id in self._progress
+
+    def start(self, block_ids: List[bytes]):
+        """Starts catching up along the given blocks (oldest first)."""
+        self.abort()
+        self._aborted.difference_update(block_ids)  # Their notifications count again
+        self._path.extend(block_ids)
+        self._progress = {b: BlockProgress.PENDING for b in block_ids}
+        self._fill_window()
+
+    def abort(self):
+        self._aborted.update(
+            b
+            for b, progress in self._progress.items()
+            if progress in (BlockProgress.VALIDATING, BlockProgress.COMMITTING)
+        )
+        self._path.clear()
+        self._progress = {}
+        self._next_to_check = 0
+
+    def on_valid(self, block_id: bytes) -> bool:
+        """Returns True if the block belongs to the catch-up."""
+        if block_id in self._aborted:
+            self._aborted.discard(block_id)
+            return True
+        if block_id not in self._progress:
+            return False
+        if self._progress[block_id] != BlockProgress.VALIDATING:
+            return True  # Repeated notification
+        self._progress[block_id] = BlockProgress.VALID
+        self._commit_next()
+        return True
+
+    def on_invalid(self, block_id: bytes) -> bool:
+        """Returns True if the block belonged to the catch-up (which is then aborted)."""
+        if block_id in self._aborted:
+            self._aborted.discard(block_id)
+            return True
+        if block_id not in self._progress:
+            return False
+        LOGGER.warning(
+            "Block %s on the catch-up path is invalid, aborting catch-up",
+            block_id.hex()[:5],
+        )
+        self.abort()
+        return True
+
+    def on_committed(self, block_id: bytes) -> bool:
+        """Returns True if the block belonged to the catch-up."""
+        if block_id in self._aborted:
+            self._aborted.discard(block_id)
+            return True
+        if not self._path or self._path[0] != block_id:
+            return False
+        self._path.popleft()
+        del self._progress[block_id]
+        self._next_to_check -= 1
+        self._commit_next()
+        self._fill_window()
+        return True
+
+    def _fill_window(self):
+        # Every submitted block stays in flight until it is committed
+        end = min(len(self._path), self._window)
+        to_check = [self._path[i] for i in range(self._next_to_check, end)]
+        if not to_check:
+            return
+        for block_id in to_check:
+            self._progress[block_id] = BlockProgress.VALIDATING
+        self._next_to_check += len(to_check)
+        self._service.check_blocks(to_check)
+
+    def _commit_next(self):
+        if self._path and self._progress[self._path[0]] == BlockProgress.VALID:
+            self._progress[self._path[0]] = BlockProgress.COMMITTING
+            self._service.commit_block(self._path[0])
@@ -14,10 +14,74 @@ REBROADCAST_BALLOT_INTERVAL = 5
 # How often the it is checked how long it has been since the peer nodes have been seen
 PEER_CHECK_INTERVAL = 3
 
-# How long it has to be since a node was seen before sending a ping
+# Random spread (fraction of the interval) of peer check deadlines, so checks do not line up
+PEER_CHECK_JITTER = 0.2
+
+# Upper bound on the interval between checks of a peer that stays unreachable (doubles per failed check)
+PEER_CHECK_MAX_INTERVAL = 60
+
+# Deadline for a liveness probe (Ping) of a peer whose stream is down
+PING_TIMEOUT = 2
+
+# How long it has to be since a node was seen before checking the liveness of its stream
 PING_THRESHOLD = 30
 
 GENESIS_BLOCK_ID = b"\x00\x00\x00\x00\x00\x00\x00\x00"
 
 # How many slots before the end of an epoch the voting for the next epoch should start
 VOTING_SLOTS = 5
+
+# Time between BOOTSTRAP_REQUEST broadcasts while waiting to be bootstrapped
+BOOTSTRAP_REQUEST_INTERVAL = 5
+
+# Maximum time to wait for all members to come online when a new network starts
+STARTUP_TIMEOUT = 70
+
+# How often to re-check a slot that could not progress yet (e.g. while waiting for a commit)
+SLOT_RETRY_INTERVAL = 0.08
+
+# Fallback interval for checking whether to vote (online peers change without engine events)
+ELECTION_CHECK_INTERVAL = 1
+
+# Upper bound on how long the engine loop sleeps without any events or due timers
+MAX_LOOP_SLEEP = 1
+
+# Maximum number of messages queued for a single peer before the oldest is dropped
+OUTBOUND_QUEUE_SIZE = 100
+
+# Interval of the keepalive pings on peer connections, and how long to wait for the
+# answer before the connection is considered dead
+KEEPALIVE_TIME = 2
+KEEPALIVE_TIMEOUT = 3
+
+# How often an idle peer stream checks whether it has been closed or replaced
+OUTBOX_POLL_INTERVAL = 1
+
+# Initial and maximum delay between attempts to re-establish a peer stream
+RECONNECT_INTERVAL = 0.5
+RECONNECT_MAX_INTERVAL = 10
+
+# Number of received blocks kept in the block cache
+BLOCK_CACHE_SIZE = 10
+
+# Number of blocks fetched from the validator during ancestor walks that are remembered
+ANCESTOR_CACHE_SIZE = 256
+
+# Maximum number of blocks in validation at the same time while fast-forwarding
+CATCH_UP_WINDOW = 8
+
+# Send only the digest of the own VOTE_RESULT if another peer has already broadcast the same result
+DIGEST_ONLY_RESULTS = False
+
+# Time to wait for the remaining ballots once enough ballots have been received to compute a result
+BALLOT_WAIT_TIMEOUT = 15
+
+# Number of computed election results remembered by (epoch, ballots)
+ELECTION_MEMO_SIZE = 8
+
+# Number of epochs (latest first) for which ballots, results and candidates are kept
+EPOCH_RETENTION = 5
+
+# Maximum number of peer messages handled per engine loop iteration (the rest is handled
+# in the next iteration, after any due timers)
+INBOUND_BATCH_SIZE = 64
@@ -0,0 +1,287 @@
+import logging
+import queue
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import grpc
+
+from pkg.config.rpc import RpcConfig, get_default_rpc_config
+import pkg.consensus.service_pb2 as service_pb2
+import pkg.consensus.service_pb2_grpc as service_pb2_grpc
+from .config import (
+    KEEPALIVE_TIME,
+    KEEPALIVE_TIMEOUT,
+    OUTBOUND_QUEUE_SIZE,
+    OUTBOX_POLL_INTERVAL,
+    RECONNECT_INTERVAL,
+    RECONNECT_MAX_INTERVAL,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+# HTTP/2 keepalive pings detect dead connections, both for outgoing channels and the server
+KEEPALIVE_OPTIONS = [
+    ("grpc.keepalive_time_ms", int(KEEPALIVE_TIME * 1000)),
+    ("grpc.keepalive_timeout_ms", int(KEEPALIVE_TIMEOUT * 1000)),
+    ("grpc.keepalive_permit_without_calls", 1),
+]
+
+COMPRESSION = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+
+def _message_size_options(config: RpcConfig) -> List[Tuple[str, int]]:
+    if config.max_message_size is None:
+        return []
+    return [
+        ("grpc.max_send_message_length", config.max_message_size),
+        ("grpc.max_receive_message_length", config.max_message_size),
+    ]
+
+
+def channel_options(config: RpcConfig) -> List[Tuple[str, int]]:
+    return KEEPALIVE_OPTIONS + _message_size_options(config) + [
+        ("grpc.http2.max_pings_without_data", 0),
+        ("grpc.initial_reconnect_backoff_ms", int(RECONNECT_INTERVAL * 1000)),
+        ("grpc.min_reconnect_backoff_ms", int(RECONNECT_INTERVAL * 1000)),
+        ("grpc.max_reconnect_backoff_ms", int(RECONNECT_MAX_INTERVAL * 1000)),
+    ]
+
+
+def server_options(config: RpcConfig) -> List[Tuple[str, int]]:
+    options = KEEPALIVE_OPTIONS + _message_size_options(config) + [
+        ("grpc.http2.min_recv_ping_interval_without_data_ms", int(KEEPALIVE_TIME * 1000)),
+        ("grpc.http2.max_ping_strikes", 0),
+    ]
+    if config.max_concurrent_streams is not None:
+        options.append(("grpc.max_concurrent_streams", config.max_concurrent_streams))
+    return options
+
+
+def compression(config: RpcConfig) -> grpc.Compression:
+    return COMPRESSION[config.compression or "none"]
+
+
+class Peer:
+    """
+    Outgoing connection to a peer. The peer owns one channel for its lifetime and sends
+    all messages over one long-lived bidirectional stream. The stream waits for the
+    channel to become ready (gRPC reconnects the channel with backoff), is re-opened with
+    exponential backoff whenever it breaks, and dead connections are detected by the
+    keepalive pings of the channel instead of application-level heartbeats.
+    `on_connection_change` is called with the new state whenever the stream connects or
+    disconnects.
+    """
+
+    def __init__(
+        self,
+        ip: str,
+        on_connection_change: Optional[Callable[[bool], None]] = None,
+        config: Optional[RpcConfig] = None,
+    ):
+        config = config or get_default_rpc_config()
+        self.ip = ip
+        self._connected = False
+        self._connected_lock = Lock()
+        self._on_connection_change = on_connection_change
+        self._state = grpc.ChannelConnectivity.IDLE
+        self._wake = Event()  # Cuts a backoff short
+        self._call = None
+        self._generation = 0
+        self._closed = False
+        self._outbox: queue.Queue = queue.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+
+        self.channel = grpc.insecure_channel(
+            f"{ip}:{config.port}",
+            options=channel_options(config),
+            compression=compression(config),
+        )
+        self.stub = service_pb2_grpc.ConsensusRPCStub(self.channel)
+        self.channel.subscribe(self._on_connectivity, try_to_connect=True)
+        self._thread = Thread(target=self._run, name=f"peer-{ip}", daemon=True)
+        self._thread.start()
+
+    def _on_connectivity(self, state: grpc.ChannelConnectivity):
+        if state != self._state:
+            LOGGER.debug("Channel to %s is %s", self.ip, state.name)
+        self._state = state
+
+    def _run(self):
+        backoff = RECONNECT_INTERVAL
+        while not self._closed:
+            try:
+                self._generation += 1
+                self._call = self.stub.Stream(
+                    self._outgoing(self._generation), wait_for_ready=True
+                )
+                for _ in self._call:
+                    self._set_connected(True)
+                    backoff = RECONNECT_INTERVAL
+            except grpc.RpcError as err:
+                LOGGER.debug("Stream to %s closed: %s", self.ip, err.code())  # type: ignore
+            except ValueError:
+                pass  # The channel was closed
+            self._set_connected(False)
+            self._drop_queued()
+
+            if not self._closed:
+                self._wake.wait(backoff)
+                if self._wake.is_set():
+                    self._wake.clear()
+                    backoff = RECONNECT_INTERVAL
+                else:
+                    backoff = min(backoff * 2, RECONNECT_MAX_INTERVAL)
+
+    def reconnect(self):
+        """Retries a broken stream right away instead of waiting for the backoff."""
+        self._wake.set()
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    def _set_connected(self, connected: bool):
+        with self._connected_lock:
+            if self._connected == connected:
+                return
+            self._connected = connected
+        if self._on_connection_change is not None:
+            self._on_connection_change(connected)
+
+    @property
+    def alive(self) -> bool:
+        return self.connected and self._state == grpc.ChannelConnectivity.READY
+
+    def ping(self, timeout: float) -> bool:
+        """Pings the peer, returning True if it answered within the timeout."""
+        try:
+            self.stub.Ping(service_pb2.Empty(), timeout=timeout)  # type: ignore
+            return True
+        except (grpc.RpcError, ValueError):
+            return False
+
+    def send(self, msg):
+        """
+        Queues a message for the stream. Messages are only queued while the stream is
+        connected, since they would be stale by the time it reconnects (ballots and
+        bootstrap requests are rebroadcast anyway). If the outbound queue is full the
+        oldest queued message is dropped.
+        """
+        if not self.connected:
+            return
+        while True:
+            try:
+                self._outbox.put_nowait(msg)
+                return
+            except queue.Full:
+                try:
+                    self._outbox.get_nowait()
+                except queue.Empty:
+                    continue
+                LOGGER.debug("Outbound queue full, dropping oldest message")
+
+    def _drop_queued(self):
+        """Drops the messages that were queued for a stream that has disconnected."""
+        dropped = 0
+        while True:
+            try:
+                self._outbox.get_nowait()
+            except queue.Empty:
+                break
+            dropped += 1
+        if dropped:
+            LOGGER.debug("Dropped %i messages queued for %s", dropped, self.ip)
+
+    def _outgoing(self, generation):
+        """Request iterator for the stream: the queued messages."""
+        while not self._closed and generation == self._generation:
+            try:
+                msg = self._outbox.get(timeout=OUTBOX_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+            if msg is None or generation != self._generation:
+                return  # Closed, or the stream this iterator belonged to was replaced
+            yield msg
+
+    def close(self):
+        self._closed = True
+        self._set_connected(False)
+        self._wake.set()
+        try:
+            self._outbox.put_nowait(None)
+        except queue.Full:
+            pass  # The stream notices that the peer is closed on its next poll
+        if self._call is not None:
+            self._call.cancel()
+        self.channel.unsubscribe(self._on_connectivity)
+        self.channel.close()
+
+
+class ConnectionManager:
+    """
+    Owns the connections to the peers: one Peer (and channel) per peer key, which is
+    reused when the peer connects again and only replaced when its address changes.
+    Peers are dialed on the port the local server binds to (the port is expected to be
+    the same on all members).
+    Keeps the number of peers with a connected stream up to date, and calls the
+    registered listeners (from the peers' connection threads) whenever it changes.
+    """
+
+    def __init__(self, config: Optional[RpcConfig] = None):
+        self._config = config or get_default_rpc_config()
+        self._peers: Dict[str, Peer] = {}
+        self._lock = Lock()
+        self._online = 0
+        self._listeners: List[Callable[[int], None]] = []
+        self._stopped = False
+
+    @property
+    def online(self) -> int:
+        return self._online
+
+    def on_online_change(self, listener: Callable[[int], None]):
+        self._listeners.append(listener)
+
+    def _connection_changed(self, connected: bool):
+        with self._lock:
+            self._online += 1 if connected else -1
+            online = self._online
+        for listener in self._listeners:
+            try:
+                listener(online)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Online peers listener failed")
+
+    def connect(self, peer_key: str, ip: str):
+        """Connects to a peer, or retries the existing connection right away."""
+        with self._lock:
+            if self._stopped:
+                return
+            peer = self._peers.get(peer_key)
+            if peer is not None and peer.ip == ip:
+                if not peer.alive:
+                    peer.reconnect()
+                return
+            self._peers[peer_key] = Peer(ip, self._connection_changed, self._config)
+
+        if peer is not None:
+            LOGGER.debug("Address of peer %s changed to %s", peer_key[:5], ip)
+            peer.close()
+
+    def get(self, peer_key: str) -> Optional[Peer]:
+        return self._peers.get(peer_key)
+
+    def items(self) -> Iterator[Tuple[str, Peer]]:
+        return iter(list(self._peers.items()))
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            peers = list(self._peers.values())
+            self._peers.clear()
+        for peer in peers:
+            peer.close()
@@ -1,111 +1,181 @@
+import asyncio
 from concurrent import futures
-from threading import Thread, Timer
-from time import sleep
 import grpc
-import queue
 import logging
-from functools import reduce
+from typing import Callable, Optional
 
 import pkg.consensus.service_pb2 as service_pb2
 import pkg.consensus.service_pb2_grpc as service_pb2_grpc
+from pkg.config.rpc import RpcConfig, get_default_rpc_config
+from .config import PING_TIMEOUT
+from .connection_manager import ConnectionManager, compression, server_options
+from .inbound_queue import InboundQueue
 
 LOGGER = logging.getLogger(__name__)
 
 
 class ConsensusRPC(service_pb2_grpc.ConsensusRPCServicer):
-    def __init__(self, queue) -> None:
+    def __init__(self, queue, notify=None) -> None:
         super().__init__()
         self.queue = queue
+        self.notify = notify
 
     def Message(self, request, context):
         self.queue.put(request)
+        if self.notify is not None:
+            self.notify()
         return service_pb2.Empty()   # type: ignore
 
     def Ping(self, request, context):
         return service_pb2.Empty()   # type: ignore
 
+    def Stream(self, request_iterator, context):
+        """
+        Receives all messages from one peer over a long-lived stream. A single heartbeat
+        acknowledges the stream, after which it stays open until the peer closes it or
+        keepalive detects that the connection is dead. The heartbeat is sent before the
+        generator resumes, so the messages are read on the handler thread itself.
+        """
+        yield service_pb2.ConsensusMessage(type=service_pb2.HEARTBEAT)  # type: ignore
+        try:
+            for request in request_iterator:
+                if request.type != service_pb2.HEARTBEAT:
+                    self.Message(request, None)
+        except grpc.RpcError:
+            pass  # The peer closed the stream, it reconnects by itself
+
+
+class AsyncConsensusRPC(service_pb2_grpc.ConsensusRPCServicer):
+    """ConsensusRPC for the grpc.aio server, where a stream does not occupy a thread."""
+
+    def __init__(self, queue, notify=None) -> None:
+        super().__init__()
+        self.queue = queue
+        self.notify = notify
+
+    def _put(self, request):
+        self.queue.put(request)
+        if self.notify is not None:
+            self.notify()
+
+    async def Message(self, request, context):
+        self._put(request)
+        return service_pb2.Empty()   # type: ignore
+
+    async def Ping(self, request, context):
+        return service_pb2.Empty()   # type: ignore
+
+    async def Stream(self, request_iterator, context):
+        """See ConsensusRPC.Stream."""
+        yield service_pb2.ConsensusMessage(type=service_pb2.HEARTBEAT)  # type: ignore
+        try:
+            async for request in request_iterator:
+                if request.type != service_pb2.HEARTBEAT:
+                    self._put(request)
+        except grpc.RpcError:
+            pass  # The peer closed the stream, it reconnects by itself
+
 
 class Communicator:
-    def __init__(self):
-        self._peers: dict[str, Peer] = {}
-        self.queue = queue.Queue()
+    def __init__(self, notify=None, num_peers=0, rpc_config: Optional[RpcConfig] = None):
+        self._rpc_config = rpc_config or get_default_rpc_config()
+        self._connections = ConnectionManager(self._rpc_config)
+        self.queue = InboundQueue()
+        self._notify = notify
+        self._num_peers = num_peers
+        self._server = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     def online_peers(self) -> int:
-        return reduce(
-            lambda acc, p: acc + 1 if p.connected else acc, self._peers.values(), 0
-        )
+        """Returns the number of peers with a connected stream (kept up to date by the peers)."""
+        return self._connections.online
+
+    def on_online_change(self, listener: Callable[[int], None]):
+        """
+        Registers a listener that is called with the new number of online peers whenever
+        it changes. Listeners are called from the peers' connection threads.
+        """
+        self._connections.on_online_change(listener)
 
     def add_peer(self, peer_key, peer_ip):
-        if (peer := self._peers.get(peer_key)) is not None:
-            if not peer.ping():
-                peer.channel.close()
-                del peer
-                self._peers[peer_key] = Peer(peer_ip)
-        else:
-            self._peers[peer_key] = Peer(peer_ip)
-
-    def recv(self):
-        try:
-            msg = self.queue.get_nowait()
-            return msg
-        except queue.Empty:
-            return None
-
-    def ping(self, peer_key) -> bool:
-        if peer_key in self._peers:
-            return self._peers[peer_key].ping()
-        else:
+        self._connections.connect(peer_key, peer_ip)
+
+    def recv_all(self, max_count=None):
+        """
+        Returns up to max_count (default all) pending messages, in priority order (see
+        InboundQueue). Messages superseded while queued have already been dropped.
+        """
+        return self.queue.get(max_count)
+
+    def pending(self) -> int:
+        return self.queue.depth
+
+    def probe(self, peer_key) -> bool:
+        """
+        Returns True if the peer is alive, pinging it (blocking for up to PING_TIMEOUT)
+        when its stream is down. Meant for the PeerMonitor thread, not the engine loop.
+        """
+        if (peer := self._connections.get(peer_key)) is None:
             return False
+        return peer.alive or peer.ping(PING_TIMEOUT)
 
     def send(self, to, msg):
-        return self._peers[to].send(msg)
+        """Queues a message for a peer without waiting for it to be sent."""
+        if (peer := self._connections.get(to)) is None:
+            LOGGER.debug("Not sending to unknown peer %s", to[:5])
+            return
+        peer.send(msg)
 
     def broadcast(self, msg):
-        threads = []
-        for peer in self._peers.values():
+        """Queues a message for every connected peer (see send)."""
+        for _, peer in self._connections.items():
             if peer.connected:
-                t = Thread(target=peer.send, args=(msg,))
-                threads.append(t)
-                t.start()
-        for t in threads:
-            t.join()
-        del threads
+                peer.send(msg)
+
+    def stop(self):
+        self._connections.stop()
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._server.stop(None), self._loop)  # type: ignore
+        elif self._server is not None:
+            self._server.stop(None)
 
     def server(self):
-        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        """Runs the gRPC server (see RpcConfig) until the communicator is stopped."""
+        config = self._rpc_config
+        LOGGER.info("Starting %s", config)
+        if config.aio:
+            asyncio.run(self._serve_aio())
+            return
+
+        # Every incoming stream occupies a worker for its lifetime
+        workers = config.workers or self._num_peers + 2
+        if workers < self._num_peers + 1:
+            LOGGER.warning(
+                "%i rpc workers cannot serve the streams of %i peers", workers, self._num_peers
+            )
+        self._server = server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=workers),
+            options=server_options(config),
+            compression=compression(config),
+        )
         service_pb2_grpc.add_ConsensusRPCServicer_to_server(
-            ConsensusRPC(self.queue), server
+            ConsensusRPC(self.queue, self._notify), server
         )
-        server.add_insecure_port("[::]:50051")
+        server.add_insecure_port(config.bind)
         server.start()
         server.wait_for_termination()
 
-
-class Peer:
-    def __init__(self, ip):
-        self.connected = False
-        connect_timer = Timer(3.0, self.connect, (ip,))  # Give peer time to start consensus engine
-        connect_timer.start()
-
-    def connect(self, ip):
-        self.channel = grpc.insecure_channel(f"{ip}:50051")
-        self.stub = service_pb2_grpc.ConsensusRPCStub(self.channel)
-
-        while not self.ping():
-            sleep(0.5)
-
-    def ping(self):
-        try:
-            _ = self.stub.Ping(service_pb2.Empty())  # type: ignore
-            self.connected = True
-            return True
-        except Exception:
-            self.connected = False
-            return False
-
-    def send(self, msg):
-        if self.connected:
-            try:
-                _ = self.stub.Message(msg)
-            except Exception:
-                LOGGER.debug("NODE IS UNAVAILABLE")
+    async def _serve_aio(self):
+        self._server = server = grpc.aio.server(
+            # Only used for the servicer's synchronous code, streams do not need a worker
+            futures.ThreadPoolExecutor(max_workers=self._rpc_config.workers or 2),
+            options=server_options(self._rpc_config),
+            compression=compression(self._rpc_config),
+        )
+        service_pb2_grpc.add_ConsensusRPCServicer_to_server(
+            AsyncConsensusRPC(self.queue, self._notify), server
+        )
+        server.add_insecure_port(self._rpc_config.bind)
+        await server.start()
+        self._loop = asyncio.get_running_loop()
+        await server.wait_for_termination()
@@ -1,10 +1,11 @@
 import logging
 import time
-from typing import Dict, List
-from threading import Thread
+from typing import Dict, List, Optional, Tuple
+from threading import Lock, Thread
 
+from pkg.config.rpc import RpcConfig
 from .consensus_messaging import Communicator
-from .config import PEER_CHECK_INTERVAL, PING_THRESHOLD
+from .peer_monitor import PeerMonitor
 from .types import Key
 from ..consensus.service_pb2 import ConsensusMessage, MessageType, Bootstrap
 
@@ -12,25 +13,61 @@ LOGGER = logging.getLogger(__name__)
 
 
 class PeerNode:
+    """
+    A member as seen by this node. Liveness (online, last_seen) is written both by the
+    engine loop and by the PeerMonitor thread, and is always replaced as a whole.
+    """
+
     def __init__(self, key: Key):
         self.key: Key = key
         self.score: float = 1.0
-        self.last_seen: float = time.time()
-        self.online: bool = False
+        self._liveness: Tuple[bool, float] = (False, time.time())
+        self._lock = Lock()
+
+    @property
+    def liveness(self) -> Tuple[bool, float]:
+        """(online, last_seen), read atomically."""
+        return self._liveness
+
+    @property
+    def online(self) -> bool:
+        return self._liveness[0]
+
+    @property
+    def last_seen(self) -> float:
+        return self._liveness[1]
 
     def seen(self):
-        self.online = True
-        self.last_seen = time.time()
+        with self._lock:
+            self._liveness = (True, time.time())
 
     def set_online(self, online: bool):
-        self.online = online
+        with self._lock:
+            self._liveness = (online, self._liveness[1])
+
+    def set_liveness(self, online: bool, last_seen: float, expected: Tuple[bool, float]) -> bool:
+        """
+        Publishes a liveness check result, unless the liveness changed since it was read
+        as `expected` (e.g. a message from the peer arrived meanwhile).
+        """
+        with self._lock:
+            if self._liveness != expected:
+                return False
+            self._liveness = (online, last_seen)
+            return True
 
     def __repr__(self) -> str:
         return f"peer({self.key}, online={self.online})"
 
 
 class ConsensusNode:
-    def __init__(self, key: str, peer_keys: List[Key]):
+    def __init__(
+        self,
+        key: str,
+        peer_keys: List[Key],
+        notify=None,
+        rpc_config: Optional[RpcConfig] = None,
+    ):
         self.key: str = key
         self.peers: Dict[str, PeerNode] = {}
         self.peer_keys = peer_keys
@@ -38,12 +75,14 @@ class ConsensusNode:
             self.add_peer(peer)
 
         self.peers[self.key].set_online(True)
-        self.last_peer_check: float = 0
 
-        self._communicator = Communicator()
+        self._communicator = Communicator(notify, len(peer_keys), rpc_config)
         rpc_thread = Thread(target=self._communicator.server, args=())
         rpc_thread.start()
 
+        self._monitor = PeerMonitor(self.peers, self._communicator.probe, self.key)
+        self._monitor.start()
+
     def add_peer(self, peer_key: Key):
         if not self.peers.get(peer_key, False):
             self.peers[peer_key] = PeerNode(peer_key)
@@ -55,27 +94,14 @@ class ConsensusNode:
     def peer_connected(self, peer_key: Key, peer_ip: str):
         self._communicator.add_peer(peer_key, peer_ip)
 
-    def check_on_peers(self):
-        now = time.time()
-        if now - self.last_peer_check > PEER_CHECK_INTERVAL:
-            for peer in self.peers.values():
-                if peer.key == self.key:
-                    continue
-
-                if now - peer.last_seen >= PING_THRESHOLD:
-                    if self.send_ping(peer.key):
-                        peer.seen()
-                    else:
-                        self.remove_peer(peer.key)
-            self.last_peer_check = now
-
     def seen(self, peer_key):
         self.peers[peer_key].seen()
 
-    ### OUTGOING MESSAGES ###
+    def stop(self):
+        self._monitor.stop()
+        self._communicator.stop()
 
-    def send_ping(self, peer_key) -> bool:
-        return self._communicator.ping(peer_key)
+    ### OUTGOING MESSAGES ###
 
     def send_bootstrap_message(self, peer_key, chain_head_id, num_blocks, pre_id):
         boot = Bootstrap()
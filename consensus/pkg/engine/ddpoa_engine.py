@@ -1,7 +1,5 @@
 import json
 import logging
-from operator import itemgetter
-import queue
 import time
 from typing import Dict, List, Tuple
 
@@ -11,35 +9,70 @@ from sawtooth_sdk.consensus.service import Block
 from sawtooth_sdk.consensus.zmq_service import ZmqService
 from sawtooth_sdk.protobuf.validator_pb2 import Message
 
+from pkg.config.exceptions import LocalConfigurationError
+from pkg.config.rpc import (
+    ON_CHAIN_SETTINGS as RPC_ON_CHAIN_SETTINGS,
+    RpcConfig,
+    get_default_rpc_config,
+    load_on_chain_rpc_config,
+    merge_rpc_config,
+)
+from .block_cache import BlockCache, ConsensusView
+from .bootstrap_tally import BootstrapTally
+from .catch_up import CatchUpPipeline
 from .utils import try_remove
-from .config import BLOCK_INTERVAL, GENESIS_BLOCK_ID, SLOT_TIMEOUT
+from .config import (
+    BLOCK_CACHE_SIZE,
+    BLOCK_INTERVAL,
+    BOOTSTRAP_REQUEST_INTERVAL,
+    ELECTION_CHECK_INTERVAL,
+    EPOCH_RETENTION,
+    GENESIS_BLOCK_ID,
+    INBOUND_BATCH_SIZE,
+    MAX_LOOP_SLEEP,
+    REBROADCAST_BALLOT_INTERVAL,
+    SLOT_RETRY_INTERVAL,
+    SLOT_TIMEOUT,
+    STARTUP_TIMEOUT,
+)
 from .ddpoa_node import DDPoANode, State
+from .event_loop import EventDispatcher, EventSource, Timers
 
 from ..consensus.consensus_data_pb2 import ConsensusData  # type: ignore
-from ..consensus.service_pb2 import MessageType, Bootstrap  # type: ignore
+from ..consensus.service_pb2 import MessageType  # type: ignore
 
 LOGGER = logging.getLogger(__name__)
 
+# Timer names used by the engine loop
+SLOT_TIMER = "slot"
+ELECTION_TIMER = "election"
+BOOTSTRAP_TIMER = "bootstrap_request"
+
 
 class DDPoAEngine(Engine):
-    def __init__(self, path_config, component_endpoint):
+    def __init__(self, path_config, component_endpoint, rpc_config=None):
         self._path_config = path_config
         self._component_endpoint = component_endpoint
+        self._rpc_config = rpc_config or RpcConfig()  # Local (command line and TOML) config
         self._service: ZmqService
         self._node: DDPoANode
         self.local_id: bytes
         self.block_cache: BlockCache
+        self._catch_up: CatchUpPipeline
         self.members: List[str]
         self.pre_committed_block: Tuple[bytes, int]
 
         self._exit = False
+        self._dispatcher = EventDispatcher()
+        self._timers = Timers()
+        self._timers_started = False
         self._slot_started_at = time.time()
         self._waiting_for_own_block: bool = False
         self._waiting_for_commit: int = 0
         self._waiting_for_validation: int = 0
 
         # Catch up parametrers
-        self.bootstrap_messages_received: List[Bootstrap] = []
+        self.bootstrap_tally = BootstrapTally()
         self._bootstrap_cache: Dict[str, Block] = {}
         self.fastforward_target: int = None  # type: ignore
         self.num_slots = None
@@ -57,12 +90,14 @@ class DDPoAEngine(Engine):
 
     def stop(self):
         self._exit = True
+        self._dispatcher.stop()
+        if (node := getattr(self, "_node", None)) is not None:
+            node.stop()
 
     def start(self, updates, service: ZmqService, startup_state):
         LOGGER.info(msg="DDPoA Engine starting...")
 
         self._service = service
-        self.block_cache = BlockCache(service)
         self.local_id = startup_state.local_peer_info.peer_id
 
         settings = self._service.get_settings(
@@ -71,7 +106,10 @@ class DDPoAEngine(Engine):
                 "sawtooth.consensus.ddpoa.members",
                 "sawtooth.consensus.ddpoa.slots",
                 "sawtooth.consensus.ddpoa.member_ips",
-            ],
+                "sawtooth.consensus.ddpoa.block_cache_size",
+                "sawtooth.consensus.ddpoa.epoch_retention",
+            ]
+            + [f"sawtooth.consensus.ddpoa.rpc_{name}" for name in RPC_ON_CHAIN_SETTINGS],
         )
 
         self.members = json.loads(
@@ -84,8 +122,26 @@ class DDPoAEngine(Engine):
 
         self.ips = {k: v for k, v in zip(self.members, ips)}
         self.num_slots = int(settings["sawtooth.consensus.ddpoa.slots"])
+        self._catch_up = CatchUpPipeline(service)
+        self.block_cache = BlockCache(
+            service,
+            self._on_chain_size(settings, "block_cache_size", BLOCK_CACHE_SIZE),
+        )
 
-        self._node = DDPoANode(self.local_id.hex(), self.members, self.num_slots)  # type: ignore
+        self._node = DDPoANode(
+            self.local_id.hex(),
+            self.members,  # type: ignore
+            self.num_slots,
+            notify=self._dispatcher.notify_peer_message,
+            epoch_retention=self._on_chain_size(settings, "epoch_retention", EPOCH_RETENTION),
+            rpc_config=merge_rpc_config(
+                [
+                    self._rpc_config,
+                    self._on_chain_rpc_config(settings),
+                    get_default_rpc_config(),
+                ]
+            ),
+        )
 
         handlers = {
             Message.CONSENSUS_NOTIFY_BLOCK_NEW: self._handle_new_block,  # type: ignore
@@ -109,6 +165,7 @@ class DDPoAEngine(Engine):
             startup_state.chain_head.block_id,
             startup_state.chain_head.block_num,
         )
+        self.block_cache.set_head(*self.pre_committed_block)
 
         LOGGER.info(
             "My activation message gave me the following chainhead: %s\n \
@@ -122,31 +179,39 @@ class DDPoAEngine(Engine):
             + "\n".join([f"{i}: {m[:5]}" for i, m in enumerate(self.members)])
         )
 
-        now: float = time.time()
-        pre_bootstrap_request: float = now
-        engine_start: float = now
+        timer_handlers = {
+            SLOT_TIMER: self._on_slot_timer,
+            ELECTION_TIMER: self._on_election_timer,
+            BOOTSTRAP_TIMER: self._on_bootstrap_timer,
+        }
+
+        engine_start: float = time.time()
         starting_up: bool = True
+        self._dispatcher.forward(updates)
 
         while True:
             try:
-                # Handle sawtooth/blockchain messages
-                try:
-                    type_tag, data = updates.get(timeout=0.08)
-                except queue.Empty:
-                    pass
+                if self._node.pending_messages:
+                    timeout = 0.0  # Messages left over from the previous batch
+                elif self._timers_started:
+                    timeout = self._timers.timeout(time.time(), MAX_LOOP_SLEEP)
                 else:
-                    try:
-                        handle_message = handlers[type_tag]
-                    except KeyError:
-                        LOGGER.error(
-                            "Unknown type tag: %s", Message.MessageType.Name(type_tag)  # type: ignore
-                        )
-                    else:
-                        handle_message(data)
-
-                # Handle consensus messages (DDPoA logic)
-                if (msg := self._node.recv()) is not None:
-                    self._handle_peer_msgs(msg)
+                    timeout = MAX_LOOP_SLEEP
+                for source, event in self._dispatcher.wait(timeout):
+                    if source == EventSource.VALIDATOR:
+                        try:
+                            self._handle_update(handlers, event)
+                        except Exception:  # pylint: disable=broad-except
+                            LOGGER.exception("Unhandled exception in validator update")
+
+                # Handle consensus messages (DDPoA logic), highest priority first and
+                # in bounded batches so that due timers run between batches
+                if msgs := self._node.recv_all(INBOUND_BATCH_SIZE):
+                    self._handle_peer_msgs(msgs)
+
+                # Results of elections tallied in the background
+                if self._node.handle_election_results():
+                    self._restart_slot(time.time())
 
                 if self._exit:
                     break
@@ -156,63 +221,147 @@ class DDPoAEngine(Engine):
                     starting_up = (
                         self._node.state != State.WAITING_FOR_BOOTSTRAP
                         and (self._node.online_peers != len(self.members))
-                        and (time.time() - engine_start < 70)
+                        and (time.time() - engine_start < STARTUP_TIMEOUT)
                     )
+                    if not starting_up:
+                        self._start_timers(engine_start)
                     continue
 
-                if self._node.state not in (
-                    State.WAITING_FOR_BOOTSTRAP,
-                    State.CATCHING_UP,
-                ):
-                    if (
-                        self._node.state != State.IDLE
-                        and self._waiting_for_validation == 0
-                    ):
-                        if self.time_for_next_block():
-                            if self._node.is_current_witness and not self.waiting():
-                                if self._summarize_block() is not None:
-                                    self._finalize_block()
-                                else:
-                                    LOGGER.debug("Broadcasting EMPTY_SLOT message")
-                                    self._node.broadcast_empty_slot()
-                                    self._next_slot(int(time.time()))
-
-                            if self.slot_is_missed() and self._node.state in (
-                                State.PRODUCTION,
-                                State.ELECTION,
-                            ):
-                                peer = self._node.expected_signer
-                                LOGGER.debug(
-                                    f"SLOT WAS MISSED by {self.members.index(peer)} / {peer[:5]}"
-                                )
-                                self.handle_missed_slot()
-
-                    if self._node.should_vote:
-                        self._node.vote()
-                    elif self._node.should_rebroadcast_ballot:
-                        self._node.rebroadcast_ballot()
-
-                    self._node.check_on_peers()
-
-                if (
-                    self._node.state == State.WAITING_FOR_BOOTSTRAP
-                    and time.time() - pre_bootstrap_request > 5
-                ):
-                    for peer in self._node.peers:
-                        self._node.send_bootstrap_request(peer)
-                    pre_bootstrap_request = time.time()
+                for name in self._timers.pop_due(time.time()):
+                    try:
+                        timer_handlers[name]()
+                    except Exception:  # pylint: disable=broad-except
+                        LOGGER.exception("Unhandled exception in %s timer", name)
+                        if not self._timers.is_scheduled(name):
+                            self._timers.schedule_in(name, MAX_LOOP_SLEEP)
 
             except Exception:  # pylint: disable=broad-except
                 LOGGER.exception("Unhandled exception in message loop")
 
-    def time_for_next_block(self) -> bool:
-        return time.time() - self._slot_started_at > BLOCK_INTERVAL
+    @staticmethod
+    def _on_chain_rpc_config(settings) -> RpcConfig:
+        """Returns the on-chain rpc settings, or an empty config if they are invalid."""
+        try:
+            return load_on_chain_rpc_config(settings)
+        except (LocalConfigurationError, ValueError) as err:
+            LOGGER.warning("Ignoring invalid on-chain rpc settings: %s", err)
+            return RpcConfig()
+
+    @staticmethod
+    def _on_chain_size(settings, name: str, default: int) -> int:
+        """
+        Returns a positive integer setting (sawtooth.consensus.ddpoa.<name>), or the
+        default if it is not set or invalid.
+        """
+        value = settings.get(f"sawtooth.consensus.ddpoa.{name}")
+        if not value:
+            return default
+        try:
+            size = int(value)
+        except ValueError:
+            size = 0
+        if size < 1:
+            LOGGER.warning("Ignoring invalid on-chain %s: %r (using %i)", name, value, default)
+            return default
+        return size
+
+    def _handle_update(self, handlers, update):
+        type_tag, data = update
+        try:
+            handle_message = handlers[type_tag]
+        except KeyError:
+            LOGGER.error(
+                "Unknown type tag: %s", Message.MessageType.Name(type_tag)  # type: ignore
+            )
+        else:
+            handle_message(data)
+
+    def _start_timers(self, engine_start: float):
+        now = time.time()
+        self._timers_started = True
+        self._timers.schedule(SLOT_TIMER, self._slot_started_at + BLOCK_INTERVAL)
+        self._timers.schedule(ELECTION_TIMER, now)
+        self._timers.schedule(
+            BOOTSTRAP_TIMER, engine_start + BOOTSTRAP_REQUEST_INTERVAL
+        )
+
+    def _restart_slot(self, start_ts: float):
+        """Starts a new slot and re-arms the deadlines that depend on it."""
+        self._slot_started_at = start_ts
+        if self._timers_started:
+            self._timers.schedule(SLOT_TIMER, start_ts + BLOCK_INTERVAL)
+            self._timers.schedule(ELECTION_TIMER, time.time())
+
+    def _on_slot_timer(self):
+        if (
+            self._node.state
+            in (State.WAITING_FOR_BOOTSTRAP, State.CATCHING_UP, State.IDLE)
+            or self._waiting_for_validation != 0
+        ):
+            self._timers.schedule_in(SLOT_TIMER, SLOT_RETRY_INTERVAL)
+            return
+
+        slot_started_at = self._slot_started_at
+        if self._node.is_current_witness and not self.waiting():
+            if self._summarize_block() is not None:
+                self._finalize_block()
+            else:
+                LOGGER.debug("Broadcasting EMPTY_SLOT message")
+                self._node.broadcast_empty_slot()
+                self._next_slot(int(time.time()))
+
+        if self.slot_is_missed() and self._node.state in (
+            State.PRODUCTION,
+            State.ELECTION,
+        ):
+            peer = self._node.expected_signer
+            LOGGER.debug(
+                f"SLOT WAS MISSED by {self.members.index(peer)} / {peer[:5]}"
+            )
+            self.handle_missed_slot()
+
+        if self._slot_started_at != slot_started_at:
+            return  # A new slot was started and its deadline scheduled
+
+        # The slot could not progress yet: wait for our own block to be committed, or
+        # for the expected signer until the slot is considered missed.
+        missed_at = slot_started_at + BLOCK_INTERVAL + SLOT_TIMEOUT
+        if self._node.is_current_witness or time.time() >= missed_at:
+            self._timers.schedule_in(SLOT_TIMER, SLOT_RETRY_INTERVAL)
+        else:
+            self._timers.schedule(SLOT_TIMER, missed_at)
+
+    def _on_election_timer(self):
+        if self._node.state not in (State.WAITING_FOR_BOOTSTRAP, State.CATCHING_UP):
+            if self._node.should_vote:
+                self._node.vote()
+            elif self._node.should_rebroadcast_ballot:
+                self._node.rebroadcast_ballot()
+
+        if self._node.state == State.ELECTION:
+            # The ballot is not rebroadcast (nor the deadline moved) if it is no longer stored
+            self._timers.schedule(
+                ELECTION_TIMER,
+                max(
+                    self._node.previous_vote_ts + REBROADCAST_BALLOT_INTERVAL,
+                    time.time() + ELECTION_CHECK_INTERVAL,
+                ),
+            )
+        else:
+            self._timers.schedule_in(ELECTION_TIMER, ELECTION_CHECK_INTERVAL)
+
+    def _on_bootstrap_timer(self):
+        self._timers.schedule_in(BOOTSTRAP_TIMER, BOOTSTRAP_REQUEST_INTERVAL)
+        if self._node.state == State.WAITING_FOR_BOOTSTRAP:
+            for peer in self._node.peers:
+                self._node.send_bootstrap_request(peer)
 
     def waiting(self):
         return (
             self._waiting_for_own_block
             or (self._waiting_for_validation > 0)
             or (self._waiting_for_commit > 0)
+            or self._catch_up.active
         )
 
     def slot_is_missed(self) -> bool:
@@ -241,7 +390,9 @@ class DDPoAEngine(Engine):
             timestamp=int(time.time()),
             epoch=self._node.epoch.number,
             witnessIdx=self._node.epoch.current_witness_idx,
-            candidates=self._node.epoch.full_candidate_list,
+            packed_candidates=self._node.members.pack(
+                self._node.epoch.full_candidate_list
+            ),
             num_slots=self._node.epoch.num_slots,
             consensus=f"{self.name()}:{self.version()}",
         )  ## Might want to put some of this info in the bootstrap message instead
@@ -268,7 +419,7 @@ class DDPoAEngine(Engine):
 
     def _next_slot(self, start_ts):
         self._node.next_slot(self.pre_committed_block[0].hex())
-        self._slot_started_at = start_ts
+        self._restart_slot(start_ts)
         self._try_cancel()
         if self._node.is_current_witness:
             self._service.initialize_block()
@@ -277,10 +428,12 @@ class DDPoAEngine(Engine):
         pre_id, pre_num = self.pre_committed_block
         if target_id == pre_id:
             self._has_requested_bootstrap = False
-            self.bootstrap_messages_received = []
+            self.bootstrap_tally.clear()
+            self.block_cache.unpin()
             return
 
-        # TODO : Priority queue - blocks received while fast forwarding need to be checked after the "fast forward"-blocks
+        # Blocks received while fast forwarding are only checked after the "fast forward"-blocks
+        # (see _handle_new_block), the pipeline commits the path in order.
         if self._node.state != State.CATCHING_UP:
             LOGGER.info(
                 "Starting FastForwarding to block %i | %s",
@@ -292,16 +445,16 @@ class DDPoAEngine(Engine):
             self.fastforward_target_id = target_id
 
             if self.block_cache.block_from_id(target_id):
+                # Keep the blocks leading to the target while catching up
+                self.block_cache.pin_chain(target_id, pre_id)
                 if self.block_cache.traversable(target_id, pre_id):
                     # Lagging behind (probably received a block later than the rest of the network)
                     block_ids = self.block_cache.block_path(target_id, pre_id)
-                    self._waiting_for_validation += len(block_ids)
-                    self._service.check_blocks(block_ids)
+                    self._catch_up.start(block_ids)
                 else:
                     # A fork has happened
-                    longest_chain = self.block_cache.longest_chain(target_id)
                     common_block, forked_block = self.common_and_forked_block(
-                        longest_chain
+                        target_id
                     )  # The block on our chain that is incompatible with the consensus chain
 
                     if common_block and forked_block:
@@ -312,28 +465,31 @@ class DDPoAEngine(Engine):
                             f"Failing committed block: {forked_block.hex()[:5]}"
                         )
                         self._service.fail_block(forked_block)
-                        new_fork = longest_chain[longest_chain.index(common_block):]
+                        new_fork = self.block_cache.block_path(target_id, common_block)
                         try_remove(new_fork, pre_id)
-                        try_remove(new_fork, common_block)
-                        self._waiting_for_validation += len(new_fork)
-                        self._service.check_blocks(new_fork)
+                        self._catch_up.start(new_fork)
 
-            elif target_id in self._bootstrap_cache.values():
+            elif target_id.hex() in self._bootstrap_cache:
                 block_ids = [
                     (b.block_id, b.block_num) for b in self._bootstrap_cache.values()
                 ]
                 block_ids.sort(key=lambda b: b[1])
-                self._waiting_for_validation += len(block_ids)
-                self._service.check_blocks([b[0] for b in block_ids])
-
-    def common_and_forked_block(self, chain: List[bytes]):
-        cur_block = self._service.get_chain_head()
-        for _ in range(10):
-            pre_id = cur_block.previous_id
-            if pre_id in chain:
-                return (pre_id, cur_block.block_id)
-            cur_block = self._service.get_blocks([pre_id])[pre_id]
-        return (None, None)
+                self._catch_up.start([b[0] for b in block_ids])
+
+    def common_and_forked_block(self, target_id: bytes):
+        """
+        Returns the newest block shared by our chain and the chain ending in target_id,
+        and the block on our chain that follows it (the one to fail).
+        """
+        try:
+            return self.block_cache.fork_point(
+                self._service.get_chain_head(), self.block_cache.get_block(target_id)
+            )
+        except exceptions.UnknownBlock:
+            LOGGER.warning(
+                "Unable to find where our chain forked from %s", target_id.hex()[:5]
+            )
+            return (None, None)
 
     def _handle_new_block(self, block: Block):
         signer = block.signer_id.hex()
@@ -349,8 +505,7 @@ class DDPoAEngine(Engine):
             self._service.fail_block(block.block_id)
             return
 
-        consensus = ConsensusData()
-        consensus.ParseFromString(block.payload)
+        consensus = self.block_cache.consensus(block)
 
         if time.time() < consensus.timestamp:
             LOGGER.warning(
@@ -364,7 +519,11 @@ class DDPoAEngine(Engine):
         self.block_cache.append(block)
 
         pre_id, pre_num = self.pre_committed_block
-        if block.previous_id == pre_id and block.block_num == pre_num + 1:
+        if (
+            block.previous_id == pre_id
+            and block.block_num == pre_num + 1
+            and not self._catch_up.contains(block.block_id)
+        ):
             if signer == self._node.expected_signer:
                 if self._waiting_for_own_block:
                     self._waiting_for_own_block = block.signer_id != self.local_id
@@ -374,11 +533,9 @@ class DDPoAEngine(Engine):
         if self._node.state == State.WAITING_FOR_BOOTSTRAP:
             self._bootstrap_cache[block.block_id.hex()] = block
             return
-        elif self._node.state == State.CATCHING_UP and self.block_cache.traversable(
-            block.block_id, self.fastforward_target_id
-        ):
-            self._waiting_for_validation += 1
-            self._service.check_blocks([block.block_id])
+        elif self._node.state == State.CATCHING_UP:
+            # Blocks after the target stay in the block cache and are checked one by one
+            # once the target is committed (see _handle_committed_block)
             return
 
         if block.block_num > pre_num + 1 and not self.waiting():
@@ -400,14 +557,13 @@ class DDPoAEngine(Engine):
 
     def _handle_valid_block(self, block_id):
         LOGGER.debug(msg=f"HANDLING VALID BLOCK {block_id.hex()[:10]}")
+        if self._catch_up.on_valid(block_id):
+            return
+
         block = self._service.get_blocks([block_id])[block_id]
         self._waiting_for_validation -= 1
         pre_id, pre_num = self.pre_committed_block
 
-        if self._node.state == State.CATCHING_UP and block.previous_id == pre_id:
-            self._service.commit_block(block_id)
-            return
-
         correct_signer = block.signer_id.hex() == self._node.expected_signer
         correct_id = block.previous_id == pre_id
         correct_num = block.block_num == pre_num + 1
@@ -423,10 +579,16 @@ class DDPoAEngine(Engine):
 
     def _handle_invalid_block(self, block_id):
         LOGGER.info(msg=f"HANDLING INVALID BLOCK: {block_id.hex()[:10]}")
-        if (block := self.block_cache.block_from_id(block_id)) is None:
-            block = self._service.get_blocks([block_id])[block_id]
-        consensus = ConsensusData()
-        consensus.ParseFromString(block.payload)
+        was_catching_up = self._catch_up.active
+        if self._catch_up.on_invalid(block_id):
+            if was_catching_up and not self._catch_up.active:
+                # Start over from the network's view of the chain
+                self._node.state = State.WAITING_FOR_BOOTSTRAP
+                self.block_cache.unpin()
+            return
+
+        block = self.block_cache.get_block(block_id)
+        consensus = self.block_cache.consensus(block)
         self._node.penalize(block.signer_id.hex())
         self._node.downgrade(block.signer_id.hex())
         self._next_slot(consensus.timestamp)
@@ -436,8 +598,7 @@ class DDPoAEngine(Engine):
         try:
             block = self._bootstrap_cache[block_id.hex()]
         except KeyError:
-            if (block := self.block_cache.block_from_id(block_id)) is None:
-                block = self._service.get_blocks([block_id])[block_id]
+            block = self.block_cache.get_block(block_id)
 
         if not block:
             LOGGER.info(
@@ -450,38 +611,66 @@ class DDPoAEngine(Engine):
                 block_id.hex()[:10],
             )
 
-        consensus = ConsensusData()
-        consensus.ParseFromString(block.payload)
+        consensus = self.block_cache.consensus(block)
 
         self.pre_committed_block = (block.block_id, block.block_num)
+        self.block_cache.set_head(block.block_id, block.block_num)
         self._node.reward(block.signer_id.hex())
-        self._waiting_for_commit -= 1
+        if not self._catch_up.on_committed(block_id):
+            self._waiting_for_commit -= 1
 
         if self._node.state == State.CATCHING_UP:
             if block.block_num == self.fastforward_target:
                 self._node.bootstrap(
                     consensus.epoch,
-                    consensus.witnessIdx,
-                    consensus.candidates,
+                    consensus.witness_idx,
+                    self._block_candidates(consensus),
                     consensus.num_slots,
                 )
-                self.bootstrap_messages_received = []
+                self.bootstrap_tally.clear()
                 self._has_requested_bootstrap = False
+                self.block_cache.unpin()
 
         self._next_slot(consensus.timestamp)
 
+        if self._catch_up.active:
+            return
+
         if next_block := self.block_cache.block_by_num_and_signer(
             block.block_num + 1, self._node.expected_signer
         ):
             self._waiting_for_validation += 1
             self._service.check_blocks([next_block.block_id])
 
-    def _handle_peer_msgs(self, msg):
+    def _block_candidates(self, consensus: ConsensusView) -> List[str]:
+        """Blocks created before candidates were packed list the member keys instead."""
+        if consensus.packed_candidates:
+            return self._node.members.unpack(consensus.packed_candidates)
+        return list(consensus.candidates)
+
+    def _handle_peer_msgs(self, msgs):
+        """
+        Handles a batch of consensus messages. The bootstrap tally is only evaluated
+        once per batch, after all BOOTSTRAP messages in it have been recorded. A message
+        that fails to be handled is logged and does not affect the rest of the batch.
+        """
+        tally_changed = False
+        for msg in msgs:
+            try:
+                tally_changed |= self._handle_peer_msg(msg)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Unhandled exception in %s message", MessageType.Name(msg.type))
+
+        if tally_changed:
+            self._handle_bootstrap_tally()
+
+    def _handle_peer_msg(self, msg) -> bool:
+        """Handles a single consensus message. Returns True if it changed the bootstrap tally."""
         consensus_msg = msg
         signer_id = msg.signer
 
         if signer_id not in self.members:
-            return
+            return False
 
         self._node.seen(signer_id)
 
@@ -492,7 +681,7 @@ class DDPoAEngine(Engine):
             LOGGER.debug(f"Received vote result from {msg.signer[:5]}")
             new_epoch = self._node.handle_vote_result(consensus_msg, signer_id)
             if new_epoch:
-                self._slot_started_at = time.time()
+                self._restart_slot(time.time())
 
         elif consensus_msg.type == MessageType.EMPTY_SLOT:
             LOGGER.debug(f"Received empty slot from {msg.signer[:5]}")
@@ -512,34 +701,22 @@ class DDPoAEngine(Engine):
                 consensus_msg.bootstrap.num_blocks,
                 consensus_msg.bootstrap.chain_head_id.hex()[:10],
             )
-            self.bootstrap_messages_received.append(consensus_msg.bootstrap)
+            return self.bootstrap_tally.add(signer_id, consensus_msg.bootstrap)
 
-            blocks = {}
-            for m in self.bootstrap_messages_received:
-                if block := blocks.get(m.chain_head_id):
-                    block["count"] += 1
-                else:
-                    blocks[m.chain_head_id] = {"num": m.num_blocks, "count": 1}
-                if block := blocks.get(m.pre_id):
-                    block["count"] += 1
-                else:
-                    blocks[m.pre_id] = {"num": m.num_blocks - 1, "count": 1}
+        return False
 
-            blocks = [(k, v["num"], v["count"]) for k, v in blocks.items()]
-            blocks.sort(key=itemgetter(2, 1), reverse=True)
-            consensus_head = blocks[0]
+    def _handle_bootstrap_tally(self):
+        head_id, head_num, count = self.bootstrap_tally.leader  # type: ignore
+        min_count = self._node.voting.consensus_amount(self._node.online_peers) - 1
 
-            LOGGER.debug(f"Chain heads: {[(b[0].hex()[:5], b[1], b[2]) for b in blocks]}\nConsensus: {(consensus_head[0].hex()[:5], consensus_head[1], consensus_head[2])}")
-            LOGGER.debug(f"consensus count: {consensus_head[2]} | min count: {self._node.voting.consensus_amount(self._node.online_peers) - 1}")
-            if (
-                consensus_head[2]
-                >= (self._node.voting.consensus_amount(self._node.online_peers) - 1)
-            ):
-                self.fastforward(consensus_head[0], consensus_head[1])
+        LOGGER.debug(f"Chain heads: {self.bootstrap_tally}\nConsensus: {(head_id.hex()[:5], head_num, count)}")
+        LOGGER.debug(f"consensus count: {count} | min count: {min_count}")
+        if count >= min_count:
+            self.fastforward(head_id, head_num)
 
-            if len(self.bootstrap_messages_received) == self._node.online_peers - 1:
-                self.bootstrap_messages_received = []
-                self._has_requested_bootstrap = False
+        if len(self.bootstrap_tally) >= self._node.online_peers - 1:
+            self.bootstrap_tally.clear()
+            self._has_requested_bootstrap = False
 
     def _handle_peer_connected(self, msg):
         peer_key = msg.peer_id.hex()
@@ -557,59 +734,6 @@ class DDPoAEngine(Engine):
         LOGGER.info(msg="HANDLING PEER DISCONNECTED")
 
 
-class BlockCache:
-    def __init__(self, service):
-        self._service = service
-        self._cache: Dict[bytes, Block] = {}
-        self._cache_ids: List[bytes] = []
-
-    def append(self, block: Block):
-        self._cache_ids.append(block.block_id)
-        self._cache[block.block_id] = block
-        if len(self._cache_ids) > 10:
-            id_to_pop = self._cache_ids.pop(0)
-            self._cache.pop(id_to_pop)
-            self._service.ignore_block(id_to_pop)
-
-    def block_from_id(self, block_id) -> Block:
-        return self._cache.get(block_id, None)  # type: ignore
-
-    def block_by_num_and_signer(self, block_num: int, signer: str):
-        for block in self._cache.values():
-            if block.block_num == block_num and block.signer_id.hex() == signer:
-                return block
-
-    def traversable(self, from_id: bytes, to_id: bytes):
-        prev: bytes = from_id
-        while curr := self._cache.get(prev, None):
-            if curr.block_id == to_id:
-                return True
-            prev = curr.previous_id
-        return prev == to_id
-
-    def contains(self, block_id: bytes):
-        return block_id in self._cache_ids
-
-    def block_path(self, from_id: bytes, to_id: bytes):
-        block_ids = []
-        cur_block = self._cache[from_id]
-        while cur_block.previous_id != to_id:
-            block_ids.append(cur_block.block_id)
-            cur_block = self._cache[cur_block.previous_id]
-        block_ids.append(cur_block.block_id)
-        block_ids.reverse()
-        return block_ids
-
-    def longest_chain(self, from_id: bytes):
-        block_ids = [from_id]
-        cur_block = self._cache[from_id]
-        while (block := self._cache.get(cur_block.previous_id, None)) is not None:
-            block_ids.append(block.block_id)
-            cur_block = block
-        block_ids.reverse()
-        return block_ids
-
-
 def log_block(block):
     LOGGER.info(
         "Block("
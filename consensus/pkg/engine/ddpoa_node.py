@@ -1,14 +1,22 @@
 import logging
-import threading
 import time
 from enum import IntEnum, unique
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
+from pkg.config.rpc import RpcConfig
 from pkg.consensus.service_pb2 import ConsensusMessage, MessageType # type: ignore
-from .config import REBROADCAST_BALLOT_INTERVAL, VOTING_SLOTS
+from .config import (
+    BALLOT_WAIT_TIMEOUT,
+    DIGEST_ONLY_RESULTS,
+    EPOCH_RETENTION,
+    REBROADCAST_BALLOT_INTERVAL,
+    VOTING_SLOTS,
+)
 from .consensus_node import ConsensusNode
+from .election_worker import ElectionWorker
 from .epoch import Epoch
-from .types import Key
+from .result_tally import result_digest
+from .types import Key, Result
 from .voting_system import VotingSystem
 
 LOGGER = logging.getLogger(__name__)
@@ -24,18 +32,29 @@ class State(IntEnum):
 
 
 class DDPoANode(ConsensusNode):
-    def __init__(self, key: str, peer_keys: List[Key], slots):
-        super().__init__(key, peer_keys)
+    def __init__(
+        self,
+        key: str,
+        peer_keys: List[Key],
+        slots,
+        notify=None,
+        epoch_retention: int = EPOCH_RETENTION,
+        rpc_config: Optional[RpcConfig] = None,
+    ):
+        super().__init__(key, peer_keys, notify, rpc_config)
         self.epoch: Epoch = Epoch(0, slots=slots)
         self.state: State = State.IDLE
-        self.voting = VotingSystem(Key(key), peer_keys, slots)
+        self.voting = VotingSystem(Key(key), peer_keys, slots, epoch_retention)
+        self.members = self.voting.members
         self.previous_vote_ts: float = 0
         self.previous_result_ts: float = 0
-        self.broadcast_timer: threading.Timer | None = None
+        self.elections = ElectionWorker(self.voting.tally, notify)
+        self._delayed_result: Optional[Tuple[int, float]] = None  # (epoch, when to compute)
         self.ready_result: Dict[int, bool] = {}
         self.num_slots = slots
 
-        self._pre_online = 0
+        self._notify = notify
+        self._communicator.on_online_change(self._online_changed)
 
     def vote(self):
         """
@@ -46,7 +65,7 @@ class DDPoANode(ConsensusNode):
         if self.state != State.CATCHING_UP:
             self.state = State.ELECTION
         msg = ConsensusMessage(
-            type=MessageType.VOTE, votes=ballot, epoch=self.epoch.next_epoch_number
+            type=MessageType.VOTE, packed_votes=ballot, epoch=self.epoch.next_epoch_number
         )
         self.broadcast(msg)
         self.previous_vote_ts = time.time()
@@ -83,9 +102,12 @@ class DDPoANode(ConsensusNode):
         return votable_state and timeout_reached
 
     def rebroadcast_ballot(self):
+        ballot = self.voting.ballots.get(self.epoch.next_epoch_number, {}).get(self.key)
+        if ballot is None:
+            return  # The epoch was overwritten in the store (e.g. after a bootstrap)
         msg = ConsensusMessage(
             type=MessageType.VOTE,
-            votes=self.voting.ballots[self.epoch.next_epoch_number][self.key], # type: ignore
+            packed_votes=ballot,  # type: ignore
             epoch=self.epoch.next_epoch_number,
         )
         self.broadcast(msg)
@@ -93,13 +115,12 @@ class DDPoANode(ConsensusNode):
 
     @property
     def online_peers(self) -> int:
-        num_online = self._communicator.online_peers() + 1  # include self
-
-        if num_online != self._pre_online:
-            LOGGER.debug(f"Online peers: {num_online}")
-            self._pre_online = num_online
+        return self._communicator.online_peers() + 1  # include self
 
-        return num_online
+    def _online_changed(self, online: int):
+        LOGGER.debug(f"Online peers: {online + 1}")
+        if self._notify is not None:
+            self._notify()  # Wake the engine loop, e.g. while waiting for members to start up
 
     @property
     def is_current_witness(self):
@@ -114,10 +135,40 @@ class DDPoANode(ConsensusNode):
         """Returns the key of the witness that should sign the next block."""
         return self.epoch.current_witness
 
-    def broadcast_result(self, epoch: int):
+    def request_result(self, epoch: int):
+        """Starts computing the result of an epoch in the background."""
+        self._delayed_result = None
+        if epoch in self.voting.ballots:
+            self.elections.submit(epoch, self.voting.ballots[epoch])
+
+    def handle_election_results(self) -> bool:
+        """
+        Broadcasts the results computed in the background, and starts a delayed computation
+        once the wait for the remaining ballots is over.
+        Returns True if a result triggers a new epoch.
+        """
+        if self._delayed_result is not None and time.time() >= self._delayed_result[1]:
+            self.request_result(self._delayed_result[0])
+
+        new_epoch = False
+        for epoch, result in self.elections.completed():
+            if epoch != self.epoch.next_epoch_number:
+                continue  # The epoch was decided while computing
+            self.broadcast_result(epoch, result)
+            new_epoch = self._check_results(epoch) or new_epoch
+        return new_epoch
+
+    def broadcast_result(self, epoch: int, result: Result):
         LOGGER.debug(f"Broadcasting result for epoch {epoch}")
-        result = self.voting.calculate_result(epoch)
-        msg = ConsensusMessage(type=MessageType.VOTE_RESULT, result=result, epoch=epoch)
+        self.voting.set_peer_result(epoch, self.key, result)  # type: ignore
+        if DIGEST_ONLY_RESULTS and self.voting.is_result_shared(epoch, result):
+            msg = ConsensusMessage(
+                type=MessageType.VOTE_RESULT, result_digest=result_digest(result), epoch=epoch
+            )
+        else:
+            msg = ConsensusMessage(
+                type=MessageType.VOTE_RESULT, packed_result=result, epoch=epoch
+            )
         self.broadcast(msg)
 
     def bootstrap(
@@ -125,8 +176,8 @@ class DDPoANode(ConsensusNode):
     ):
         self.num_slots = num_slots
         self.epoch = Epoch(epoch_num, num_slots)
-        self.epoch.set_candidates_and_witnesses(candidates)
         self.epoch.current_witness_idx = witness_idx
+        self.epoch.set_candidates_and_witnesses(candidates)
         self.state = State.PRODUCTION
 
     def initialize_epoch(self, epoch: int):
@@ -146,7 +197,8 @@ class DDPoANode(ConsensusNode):
                 "I am witness: %i in epoch %i", witness_number, self.epoch.number
             )
 
-        self.voting.remove_old_epoch_data()
+        LOGGER.debug("Voting data size (bytes): %s", self.voting.memory_usage())
+        LOGGER.debug("Inbound queue: %s", self._communicator.queue.stats())
 
     def finalize_epoch(self):
         LOGGER.debug("Finalizing epoch %i", self.epoch.number)
@@ -180,8 +232,16 @@ class DDPoANode(ConsensusNode):
         msg = ConsensusMessage(type=MessageType.BOOTSTRAP_REQUEST)
         self.broadcast(msg)
 
-    def recv(self):
-        return self._communicator.recv()
+    def recv_all(self, max_count=None):
+        return self._communicator.recv_all(max_count)
+
+    @property
+    def pending_messages(self) -> int:
+        return self._communicator.pending()
+
+    def stop(self):
+        super().stop()
+        self.elections.stop()
 
     # Message Handlers #
 
@@ -196,18 +256,16 @@ class DDPoANode(ConsensusNode):
 
         LOGGER.debug(f"Received ballot for epoch {msg.epoch} from {peer_key[:5]}")
 
-        self.voting.add_ballot(msg.epoch, peer_key, msg.votes)
+        ballot = self._packed(msg.packed_votes, msg.votes, peer_key)
+        if ballot is None:
+            return
 
-        if self.broadcast_timer is not None:
-            self.broadcast_timer.cancel()
+        self.voting.add_ballot(msg.epoch, peer_key, ballot)  # type: ignore
 
         if self.voting.has_all_ballots(msg.epoch, self.online_peers):
-            self.broadcast_result(msg.epoch)
+            self.request_result(msg.epoch)
         elif self.voting.has_enough_ballots(msg.epoch, self.online_peers):
-            self.broadcast_timer = threading.Timer(
-                15.0, self.broadcast_result, (msg.epoch,)
-            )
-            self.broadcast_timer.start()
+            self._delayed_result = (msg.epoch, time.time() + BALLOT_WAIT_TIMEOUT)
 
     def handle_vote_result(self, msg: ConsensusMessage, peer_key: Key) -> bool:
         """
@@ -217,20 +275,53 @@ class DDPoANode(ConsensusNode):
         if msg.epoch != self.epoch.next_epoch_number:
             return False
 
-        self.voting.set_peer_result(msg.epoch, peer_key, tuple(msg.result))  # type: ignore
-        result, count = self.voting.get_consensus_result(msg.epoch)
+        if msg.result_digest and not (msg.packed_result or msg.result):
+            self.voting.set_peer_result(msg.epoch, peer_key, None, msg.result_digest)  # type: ignore
+        else:
+            packed_result = self._packed(msg.packed_result, msg.result, peer_key)
+            if packed_result is None:
+                return False
+            self.voting.set_peer_result(msg.epoch, peer_key, packed_result)  # type: ignore
+
+        return self._check_results(msg.epoch)
+
+    def _check_results(self, epoch: int) -> bool:
+        """
+        Adopts the leading result if enough peers agree on it.
+        Return True if this triggers a new epoch, False otherwise.
+        """
+        result, count = self.voting.get_consensus_result(epoch)
+        if result is None:
+            # Only the digest of the leading result is known, wait for the full result
+            return False
 
         trigger_new_epoch = count >= self.voting.consensus_amount(self.online_peers) and self.epoch.number != 0
         trigger_first_epoch = count == self.online_peers and self.epoch.number == 0
 
         if trigger_new_epoch or trigger_first_epoch:
-            self.ready_result[msg.epoch] = True
-            self.voting.set_candidates(msg.epoch, result)
+            self.ready_result[epoch] = True
+            self.voting.set_candidates(epoch, result)
             if self.epoch.is_over:
-                self.initialize_epoch(msg.epoch)
+                self.initialize_epoch(epoch)
                 return True
         return False
 
+    def _packed(self, packed: bytes, keys: List[str], peer_key: Key) -> Optional[bytes]:
+        """
+        Returns the packed member indices of a ballot or result, packing the key list if
+        the peer did not send the packed field. Returns None if the message is malformed.
+        """
+        if not packed and keys:
+            if not all(k in self.members for k in keys):
+                LOGGER.warning("Received unknown member keys from %s", peer_key[:5])
+                return None
+            return self.members.pack(keys)  # type: ignore
+
+        if not self.members.valid(packed):
+            LOGGER.warning("Received malformed member indices from %s", peer_key[:5])
+            return None
+        return packed
+
     def next_slot(self, block_id: str):
         try:
             self.epoch.increment_witness(block_id)
@@ -0,0 +1,100 @@
+import logging
+import queue
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from hashlib import sha256
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .config import ELECTION_MEMO_SIZE
+from .types import Ballot, Key, Result
+
+LOGGER = logging.getLogger(__name__)
+
+
+def ballot_set_digest(ballots: Dict[Key, Ballot]) -> bytes:
+    """Canonical digest of the ballots of an epoch (independent of arrival order)."""
+    digest = sha256()
+    for key in sorted(ballots):
+        digest.update(key.encode())
+        digest.update(len(ballots[key]).to_bytes(4, "big"))
+        digest.update(ballots[key])
+    return digest.digest()
+
+
+class ElectionWorker:
+    """
+    Tallies elections on a background thread so the engine loop keeps producing blocks.
+    Results are handed back through a queue (and the loop is woken up with `notify`),
+    and are memoised by (epoch, ballot-set digest), so triggering the same election
+    again never recomputes it. `submit` and `completed` must be called from the engine
+    loop, the worker thread only touches the hand-off queue.
+    """
+
+    def __init__(
+        self,
+        tally: Callable[[int, List[Ballot]], Result],
+        notify: Optional[Callable[[], None]] = None,
+        memo_size: int = ELECTION_MEMO_SIZE,
+    ):
+        self._tally = tally
+        self._notify = notify
+        self._memo_size = memo_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="election")
+        self._done: queue.Queue = queue.Queue()
+        self._memo: "OrderedDict[Tuple[int, bytes], Result]" = OrderedDict()
+        self._pending: Set[Tuple[int, bytes]] = set()
+        self._futures: Set[Future] = set()
+
+    def submit(self, epoch_number: int, ballots: Dict[Key, Ballot]):
+        """Starts tallying the given ballots, unless the same election is already done or running."""
+        key = (epoch_number, ballot_set_digest(ballots))
+        if key in self._pending:
+            return
+
+        if (result := self._memo.get(key)) is not None:
+            self._memo.move_to_end(key)
+            self._done.put((key, result))
+            self._wake_up()
+            return
+
+        self._pending.add(key)
+        future = self._executor.submit(self._run, key, list(ballots.values()))
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+
+    def _run(self, key: Tuple[int, bytes], ballots: List[Ballot]):
+        try:
+            result = self._tally(key[0], ballots)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Failed to tally the election for epoch %i", key[0])
+            result = None
+        self._done.put((key, result))
+        self._wake_up()
+
+    def _wake_up(self):
+        if self._notify is not None:
+            self._notify()
+
+    def completed(self) -> List[Tuple[int, Result]]:
+        """Returns (epoch, result) for every election finished since the last call."""
+        finished = []
+        while True:
+            try:
+                key, result = self._done.get_nowait()
+            except queue.Empty:
+                return finished
+
+            self._pending.discard(key)
+            if result is None:
+                continue
+
+            self._memo[key] = result
+            self._memo.move_to_end(key)
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+            finished.append((key[0], result))
+
+    def stop(self):
+        for future in list(self._futures):
+            future.cancel()  # Elections that have not started yet
+        self._executor.shutdown(wait=False)
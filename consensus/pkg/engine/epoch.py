@@ -1,10 +1,10 @@
 import logging
-from queue import Queue
 from typing import List
 
+from .candidate_pool import CandidatePool
 from .config import ROUNDS_PER_EPOCH
 from .types import Key
-from .utils import concat_and_hash
+from .witness_schedule import WitnessSchedule
 
 LOGGER = logging.getLogger(__name__)
 
@@ -18,8 +18,8 @@ class Epoch:
     def __init__(self, number: int, slots: int):
         self.number: int = number
         self.current_witness_idx: int = 0
-        self.candidates: Queue = Queue()
-        self.witnesses: List[Key] = []
+        self.candidates = CandidatePool()
+        self.schedule = WitnessSchedule()
         self.num_slots = slots
 
     def set_candidates_and_witnesses(self, candidates: List[Key]):
@@ -28,9 +28,9 @@ class Epoch:
         in the candidate queue.
         """
 
-        self.witnesses = candidates[: self.num_slots]
-        for candidate in candidates[self.num_slots :]:
-            self.candidates.put(candidate)
+        witnesses = candidates[: self.num_slots]
+        self.schedule.set_witnesses(witnesses)
+        self.candidates = CandidatePool(candidates[self.num_slots :])
 
     def increment_witness(self, pre_block_id: str):
         """
@@ -53,28 +53,27 @@ class Epoch:
         """
         Replaces a witness with one from the candidates list (if the provided key belongs
         to a witness). The replaced witness is placed at the back of the candidates queue.
+        If there are no candidates, the witness keeps its slot.
         """
         if not self.is_witness(witness_key):
             return
 
-        downgraded_idx = self.witnesses.index(witness_key)
-        upgraded_candidate = self.candidates.get()
-        self.candidates.put(witness_key)
-        self.witnesses[downgraded_idx] = upgraded_candidate
+        upgraded_candidate = self.candidates.swap(witness_key)
+        if upgraded_candidate is None:
+            LOGGER.warning("No candidate available to replace witness %s", witness_key[:5])
+            return
+        self.schedule.replace(witness_key, upgraded_candidate)
 
     def is_witness(self, node_key: Key):
         """Returns True if node is a witness the in epoch."""
-        return node_key in self.witnesses
+        return node_key in self.schedule
 
     def position_in_witness_list(self, node_key: Key):
         """
         Returns index in witness list if the node is in it.
         If the node is not a witness, None is returned.
         """
-        try:
-            return self.witnesses.index(node_key)
-        except ValueError:
-            return None
+        return self.schedule.index(node_key)
 
     def reorder_witnesslist(self, seed):
         """
@@ -82,13 +81,12 @@ class Epoch:
         seed is used again, which happens if block_id is the seed and no new block has been produced).
         Used to make it difficult to predict block producers further ahead than in the current round of the epoch.
         """
-        hashes = [
-            (w, concat_and_hash(w, seed, self.current_witness_idx))
-            for w in self.witnesses
-        ]
-        hashes.sort(key=lambda h: h[1])
-        witnesslist = list(map(lambda h: h[0], hashes))
-        self.witnesses = witnesslist
+        self.schedule.reorder(seed, self.current_witness_idx)
+
+    @property
+    def witnesses(self) -> List[Key]:
+        """The witness list in the order of the current round."""
+        return self.schedule.witnesses
 
     @property
     def current_witness(self) -> Key:
@@ -96,13 +94,7 @@ class Epoch:
         Returns the key of the current witness or None if there
         is no current witness (the epoch is over or not started).
         """
-        if not self.witnesses:
-            return None
-        idx = self.current_witness_idx % len(self.witnesses)
-        try:
-            return self.witnesses[idx]
-        except IndexError:
-            return None
+        return self.schedule.signer(self.current_witness_idx)
 
     @property
     def next_witness(self) -> Key:
@@ -113,12 +105,7 @@ class Epoch:
         if not self.witnesses:
             LOGGER.debug("No witnesses in epoch: %s", self)
             return None
-        idx = (self.current_witness_idx + 1) % len(self.witnesses)
-        try:
-            return self.witnesses[idx]
-        except IndexError:
-            LOGGER.debug("Witness %s not found in epoch: %s", idx, self)
-            return None
+        return self.schedule.signer(self.current_witness_idx + 1)
 
     @property
     def is_initialized(self) -> bool:
@@ -161,7 +148,7 @@ class Epoch:
     @property
     def full_candidate_list(self) -> List[Key]:
         """Returns witness list concatenated with candidate list (used to bootsrap other nodes)."""
-        return list(self.witnesses) + list(self.candidates.queue)
+        return list(self.witnesses) + list(self.candidates.snapshot())
 
     def __str__(self):
         return (
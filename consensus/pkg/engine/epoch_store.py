@@ -0,0 +1,73 @@
+import logging
+import sys
+from typing import Callable, Generic, Iterator, List, Optional, TypeVar
+
+from .config import EPOCH_RETENTION
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class EpochStore(Generic[T]):
+    """
+    Per-epoch values kept in a ring buffer of `retention` slots (epoch % retention).
+    Storing an epoch overwrites the value of the epoch `retention` epochs before it, so
+    at most the latest `retention` epochs are kept and memory stays flat. Values for
+    epochs that are already outside the window are not stored.
+    """
+
+    def __init__(
+        self,
+        retention: int = EPOCH_RETENTION,
+        size_of: Callable[[T], int] = sys.getsizeof,
+    ):
+        self.retention = retention
+        self._size_of = size_of
+        self._epochs: List[Optional[int]] = [None] * retention
+        self._values: List[Optional[T]] = [None] * retention
+
+    def __contains__(self, epoch) -> bool:
+        return self._epochs[epoch % self.retention] == epoch
+
+    def __getitem__(self, epoch: int) -> T:
+        if epoch not in self:
+            raise KeyError(epoch)
+        return self._values[epoch % self.retention]  # type: ignore
+
+    def get(self, epoch: int, default=None):
+        return self[epoch] if epoch in self else default
+
+    def __setitem__(self, epoch: int, value: T):
+        i = epoch % self.retention
+        if self._epochs[i] is not None and self._epochs[i] > epoch:  # type: ignore
+            LOGGER.debug("Not storing data for epoch %i (outside the window)", epoch)
+            return
+        self._epochs[i] = epoch
+        self._values[i] = value
+
+    def get_or_create(self, epoch: int, factory: Callable[[], T]) -> T:
+        """Returns the value for an epoch, storing a new one from the factory if missing."""
+        if epoch in self:
+            return self[epoch]
+        value = factory()
+        self[epoch] = value  # Not kept if the epoch is outside the window
+        return value
+
+    def __len__(self) -> int:
+        return sum(1 for e in self._epochs if e is not None)
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterates over the stored epochs, oldest first."""
+        return iter(sorted(e for e in self._epochs if e is not None))
+
+    def memory_usage(self) -> int:
+        """Approximate number of bytes used by the stored values."""
+        return sum(
+            self._size_of(v)  # type: ignore
+            for e, v in zip(self._epochs, self._values)
+            if e is not None
+        )
+
+    def __str__(self):
+        return str({e: self[e] for e in self})
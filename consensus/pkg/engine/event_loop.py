@@ -0,0 +1,117 @@
+import heapq
+import itertools
+import logging
+import queue
+import time
+from enum import IntEnum, unique
+from threading import Thread
+from typing import Any, Dict, List, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+
+@unique
+class EventSource(IntEnum):
+    VALIDATOR = 0
+    PEER = 1
+
+
+class EventDispatcher:
+    """
+    Single inbox for everything the engine reacts to. Validator updates are forwarded
+    from the driver's queue by a background thread, and the peer communicator posts a
+    wake-up whenever a consensus message arrives, so the engine loop can block on one
+    queue and still react immediately to either source.
+    """
+
+    def __init__(self):
+        self._inbox: queue.Queue = queue.Queue()
+        self._exit = False
+
+    def forward(self, updates: queue.Queue):
+        """Starts forwarding validator updates into the inbox."""
+        thread = Thread(target=self._forward, args=(updates,), daemon=True)
+        thread.start()
+
+    def _forward(self, updates: queue.Queue):
+        while not self._exit:
+            try:
+                update = updates.get(timeout=1)
+            except queue.Empty:
+                continue
+            self._inbox.put((EventSource.VALIDATOR, update))
+
+    def notify_peer_message(self):
+        """Wakes up the engine loop (called from the RPC threads)."""
+        self._inbox.put((EventSource.PEER, None))
+
+    def wait(self, timeout: Optional[float]) -> List[Tuple[EventSource, Any]]:
+        """
+        Blocks until at least one event is available (or the timeout expires) and
+        returns every event that is pending at that point.
+        """
+        try:
+            events = [self._inbox.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        while True:
+            try:
+                events.append(self._inbox.get_nowait())
+            except queue.Empty:
+                return events
+
+    def stop(self):
+        self._exit = True
+        self._inbox.put((EventSource.PEER, None))  # Wake up the engine loop
+
+
+class Timers:
+    """
+    Named deadlines kept in a min-heap. Rescheduling a name replaces its previous
+    deadline (stale heap entries are skipped lazily when popped).
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str]] = []
+        self._deadlines: Dict[str, Tuple[float, int]] = {}
+        self._counter = itertools.count()
+
+    def schedule(self, name: str, deadline: float):
+        entry = (deadline, next(self._counter))
+        self._deadlines[name] = entry
+        heapq.heappush(self._heap, (entry[0], entry[1], name))
+
+    def schedule_in(self, name: str, delay: float):
+        self.schedule(name, time.time() + delay)
+
+    def cancel(self, name: str):
+        self._deadlines.pop(name, None)
+
+    def is_scheduled(self, name: str) -> bool:
+        return name in self._deadlines
+
+    def _discard_stale(self):
+        while self._heap:
+            deadline, seq, name = self._heap[0]
+            if self._deadlines.get(name) == (deadline, seq):
+                return
+            heapq.heappop(self._heap)
+
+    def timeout(self, now: float, maximum: float) -> float:
+        """Returns how long the loop may sleep before the next deadline is due."""
+        self._discard_stale()
+        if not self._heap:
+            return maximum
+        return min(maximum, max(0.0, self._heap[0][0] - now))
+
+    def pop_due(self, now: float) -> List[str]:
+        """Removes and returns the names of all deadlines that have passed, earliest first."""
+        due = []
+        self._discard_stale()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, name = heapq.heappop(self._heap)
+            del self._deadlines[name]
+            due.append(name)
+            self._discard_stale()
+        return due
@@ -0,0 +1,115 @@
+from collections import Counter, OrderedDict, deque
+from threading import Lock
+from typing import Deque, Dict, List, Optional
+
+import pkg.consensus.service_pb2 as service_pb2
+
+# Messages are handled level by level (lowest first). EMPTY_SLOT and VOTE_RESULT gate slot
+# progression and share a level, so that their order from one sender is kept (a result can
+# start the epoch that an empty slot belongs to). Unknown types are handled last.
+MESSAGE_PRIORITIES = {
+    service_pb2.EMPTY_SLOT: 0,
+    service_pb2.VOTE_RESULT: 0,
+    service_pb2.VOTE: 1,
+    service_pb2.BOOTSTRAP_REQUEST: 2,
+    service_pb2.BOOTSTRAP: 2,
+    service_pb2.SYNC_REQUEST: 2,
+}
+
+
+def coalesce_key(msg):
+    """
+    Returns a key that is shared by messages where only the newest one matters
+    (rebroadcast ballots, repeated results and bootstrap traffic from the same peer),
+    or None if the message must always be handled.
+    """
+    if msg.type in (service_pb2.VOTE, service_pb2.VOTE_RESULT):
+        return (msg.type, msg.signer, msg.epoch)
+    if msg.type in (service_pb2.BOOTSTRAP, service_pb2.BOOTSTRAP_REQUEST):
+        return (msg.type, msg.signer)
+    return None
+
+
+class InboundQueue:
+    """
+    Queue of the consensus messages received from peers, filled by the RPC threads and
+    drained by the engine loop. Messages are returned by priority (MESSAGE_PRIORITIES);
+    within a priority the senders take turns, and the messages of one sender keep their
+    order. A message that supersedes one that is still queued (see coalesce_key) replaces
+    it in place instead of being queued again.
+    """
+
+    def __init__(self, priorities: Optional[Dict[int, int]] = None):
+        self._priorities = MESSAGE_PRIORITIES if priorities is None else priorities
+        self._lowest = max(self._priorities.values(), default=0) + 1
+        # Per priority: sender -> its queued entries ([msg], so they can be replaced)
+        self._levels: List["OrderedDict[str, Deque[list]]"] = [
+            OrderedDict() for _ in range(self._lowest + 1)
+        ]
+        self._queued: Dict[tuple, list] = {}  # Coalesce key -> queued entry
+        self._depths: Counter = Counter()  # Message type -> number queued
+        self._depth = 0
+        self._lock = Lock()
+        self.suppressed = 0
+        self.high_water = 0
+
+    def put(self, msg):
+        key = coalesce_key(msg)
+        with self._lock:
+            if key is not None and (entry := self._queued.get(key)) is not None:
+                entry[0] = msg
+                self.suppressed += 1
+                return
+
+            entry = [msg]
+            senders = self._levels[self._priorities.get(msg.type, self._lowest)]
+            if (queued := senders.get(msg.signer)) is None:
+                queued = senders[msg.signer] = deque()
+            queued.append(entry)
+            if key is not None:
+                self._queued[key] = entry
+            self._depths[msg.type] += 1
+            self._depth += 1
+            self.high_water = max(self.high_water, self._depth)
+
+    def get(self, max_count: Optional[int] = None) -> list:
+        """Returns up to max_count (default all) queued messages in handling order."""
+        msgs = []
+        with self._lock:
+            for senders in self._levels:
+                while senders and (max_count is None or len(msgs) < max_count):
+                    sender, queued = next(iter(senders.items()))
+                    msg = queued.popleft()[0]
+                    if queued:
+                        senders.move_to_end(sender)  # Next sender's turn
+                    else:
+                        del senders[sender]
+
+                    if (key := coalesce_key(msg)) is not None:
+                        del self._queued[key]
+                    self._depths[msg.type] -= 1
+                    self._depth -= 1
+                    msgs.append(msg)
+        return msgs
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._depth
+
+    @property
+    def depth(self) -> int:
+        """Number of queued messages."""
+        return len(self)
+
+    def stats(self) -> dict:
+        """Queue depth per message type, the highest depth seen and suppressed duplicates."""
+        with self._lock:
+            by_type = {
+                service_pb2.MessageType.Name(t): n for t, n in self._depths.items() if n
+            }
+        return {
+            "depth": sum(by_type.values()),
+            "by_type": by_type,
+            "high_water": self.high_water,
+            "suppressed": self.suppressed,
+        }
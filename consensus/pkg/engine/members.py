@@ -0,0 +1,63 @@
+import sys
+from array import array
+from typing import Dict, Iterable, List
+
+from .types import Key
+
+
+class Members:
+    """
+    Maps the members (in the order of the on-chain `sawtooth.consensus.ddpoa.members`
+    setting) to small integer indices. Ballots, results and candidate lists are sent
+    and stored as packed arrays of indices: one byte per member for networks of up to
+    256 members, two bytes (little-endian) otherwise.
+    """
+
+    def __init__(self, keys: Iterable[Key]):
+        self.keys: List[Key] = list(keys)
+        self._indices: Dict[Key, int] = {k: i for i, k in enumerate(self.keys)}
+        self._typecode = "B" if len(self.keys) <= 256 else "H"
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key) -> bool:
+        return key in self._indices
+
+    def index(self, key: Key) -> int:
+        return self._indices[key]
+
+    def key(self, index: int) -> Key:
+        return self.keys[index]
+
+    def valid(self, packed: bytes) -> bool:
+        """Returns True if the bytes are a well-formed packed list of member indices."""
+        try:
+            indices = self.unpack_indices(packed)
+        except ValueError:
+            return False
+        return not indices or max(indices) < len(self.keys)
+
+    def pack_indices(self, indices: Iterable[int]) -> bytes:
+        packed = array(self._typecode, indices)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        return packed.tobytes()
+
+    def unpack_indices(self, packed: bytes) -> array:
+        """Raises ValueError if the length does not fit the encoding."""
+        indices = array(self._typecode)
+        indices.frombytes(packed)
+        if sys.byteorder == "big":
+            indices.byteswap()
+        return indices
+
+    def pack(self, keys: Iterable[Key]) -> bytes:
+        """Packs member keys. Raises KeyError for keys that are not members."""
+        return self.pack_indices(self._indices[k] for k in keys)
+
+    def unpack(self, packed: bytes) -> List[Key]:
+        """Raises ValueError if the packed indices are malformed or out of range."""
+        if not self.valid(packed):
+            raise ValueError("Malformed packed member indices")
+        return [self.keys[i] for i in self.unpack_indices(packed)]
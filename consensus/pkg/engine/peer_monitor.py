@@ -0,0 +1,82 @@
+import heapq
+import logging
+import random
+import time
+from threading import Event, Thread
+from typing import Callable, Dict, List, Tuple
+
+from .config import (
+    PEER_CHECK_INTERVAL,
+    PEER_CHECK_JITTER,
+    PEER_CHECK_MAX_INTERVAL,
+    PING_THRESHOLD,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PeerMonitor:
+    """
+    Checks the liveness of peers on a background thread, so the engine loop never waits
+    on the network. Every peer has its own deadline for the next check, spread out by a
+    random jitter. Peers that have not been seen for PING_THRESHOLD seconds are probed;
+    the interval between checks doubles (up to PEER_CHECK_MAX_INTERVAL) for as long as a
+    peer stays dead. Results are published to the PeerNodes (see PeerNode.set_liveness).
+    """
+
+    def __init__(self, peers: Dict, probe: Callable[[str], bool], own_key: str):
+        self._peers = peers
+        self._probe = probe
+        self._own_key = own_key
+        self._intervals: Dict[str, float] = {}
+        self._deadlines: List[Tuple[float, str]] = []
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name="peer-monitor", daemon=True)
+
+    def start(self):
+        now = time.time()
+        for key in list(self._peers):
+            if key != self._own_key:
+                self._intervals[key] = PEER_CHECK_INTERVAL
+                heapq.heappush(self._deadlines, (now + self._jittered(PEER_CHECK_INTERVAL), key))
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @staticmethod
+    def _jittered(interval: float) -> float:
+        return interval * random.uniform(1 - PEER_CHECK_JITTER, 1 + PEER_CHECK_JITTER)
+
+    def _run(self):
+        while self._deadlines and not self._stop.is_set():
+            deadline, key = self._deadlines[0]
+            if self._stop.wait(max(0.0, deadline - time.time())):
+                return
+            heapq.heappop(self._deadlines)
+
+            try:
+                interval = self._check(key)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Failed to check peer %s", key[:5])
+                interval = PEER_CHECK_INTERVAL
+            heapq.heappush(self._deadlines, (time.time() + self._jittered(interval), key))
+
+    def _check(self, key: str) -> float:
+        """Checks one peer and returns the interval until its next check."""
+        peer = self._peers[key]
+        online, last_seen = peer.liveness  # Read once, published only if unchanged
+        now = time.time()
+        if online and now - last_seen < PING_THRESHOLD:
+            self._intervals[key] = PEER_CHECK_INTERVAL
+            return PEER_CHECK_INTERVAL
+
+        alive = self._probe(key)
+        published = peer.set_liveness(alive, now if alive else last_seen, (online, last_seen))
+        if alive or not published:  # Not published: the peer was seen while probing
+            self._intervals[key] = PEER_CHECK_INTERVAL
+        else:
+            if online:
+                LOGGER.debug("Peer %s is not responding", key[:5])
+            self._intervals[key] = min(self._intervals[key] * 2, PEER_CHECK_MAX_INTERVAL)
+        return self._intervals[key]
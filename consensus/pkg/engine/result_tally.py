@@ -0,0 +1,92 @@
+import sys
+from hashlib import sha256
+from typing import Dict, Optional, Set, Tuple
+
+from .types import Key, Result
+
+
+def result_digest(result: Result) -> bytes:
+    """Canonical digest of a (packed) result."""
+    return sha256(result).digest()
+
+
+class ResultTally:
+    """
+    Counts the VOTE_RESULTs of one epoch by digest. Only the latest result per peer is
+    counted, counts are updated in O(1) per message and the leading digest is kept up to
+    date. Full results are remembered per digest, so peers may send only the digest of a
+    result that has already been broadcast in full.
+    """
+
+    def __init__(self, own_key: Key):
+        self._own_key = own_key
+        self._digests: Dict[Key, bytes] = {}
+        self._counts: Dict[bytes, int] = {}
+        self._results: Dict[bytes, Result] = {}
+        self._shared: Set[bytes] = set()  # Digests received in full from other peers
+        self._leader: Optional[bytes] = None
+
+    def __len__(self) -> int:
+        """Returns the number of peers that have sent a result."""
+        return len(self._digests)
+
+    def add(self, peer_key: Key, digest: bytes, result: Optional[Result] = None):
+        """Records the result (or only the digest of the result) of a peer."""
+        if result is not None:
+            self._results.setdefault(digest, result)
+            if peer_key != self._own_key:
+                self._shared.add(digest)
+
+        if (previous := self._digests.get(peer_key)) == digest:
+            return
+
+        self._digests[peer_key] = digest
+        if previous is not None:
+            self._decrement(previous)
+
+        self._counts[digest] = self._counts.get(digest, 0) + 1
+        if self._leader is None or self._counts[digest] > self._counts[self._leader]:
+            self._leader = digest
+
+    def _decrement(self, digest: bytes):
+        self._counts[digest] -= 1
+        if self._counts[digest] == 0:
+            del self._counts[digest]
+        if digest == self._leader:
+            # Rare (a peer changed its result), find the new leader from scratch
+            self._leader = max(self._counts, key=self._counts.get, default=None)
+
+    def count(self, digest: bytes) -> int:
+        return self._counts.get(digest, 0)
+
+    def digest_of(self, peer_key: Key) -> Optional[bytes]:
+        return self._digests.get(peer_key)
+
+    def result(self, digest: bytes) -> Optional[Result]:
+        """Returns the full result for a digest, if it has been received."""
+        return self._results.get(digest)
+
+    def is_shared(self, digest: bytes) -> bool:
+        """Returns True if another peer has broadcast the full result for the digest."""
+        return digest in self._shared
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._digests)
+            + sys.getsizeof(self._counts)
+            + sys.getsizeof(self._results)
+            + sys.getsizeof(self._shared)
+            + sum(sys.getsizeof(d) for d in self._counts)
+            + sum(sys.getsizeof(r) for r in self._results.values())
+        )
+
+    @property
+    def leader(self) -> Optional[Tuple[bytes, int]]:
+        """Returns (digest, count) of the result sent by most peers, if any."""
+        if self._leader is None:
+            return None
+        return (self._leader, self._counts[self._leader])
+
+    def __str__(self):
+        return ", ".join(f"({d.hex()[:5]}, {c})" for d, c in self._counts.items())
@@ -0,0 +1,191 @@
+import logging
+from array import array
+from enum import IntEnum, unique
+from typing import Iterable, List, Optional, Sequence
+
+LOGGER = logging.getLogger(__name__)
+
+# Fixed-point scale of vote values. All arithmetic is done on integers, so the
+# result does not depend on the platform or on the order ballots were received in.
+VOTE_SCALE = 10**12
+
+# Transfer values are rounded (half to even) to 5 decimals, as in Scottish STV
+TRANSFER_SCALE = 10**5
+
+
+@unique
+class CandidateStatus(IntEnum):
+    HOPEFUL = 0
+    ELECTED = 1
+    EXCLUDED = 2
+
+
+class STVTally:
+    """
+    Deterministic Scottish STV tally over integer-encoded candidates (0..num_candidates-1).
+
+    Ballots are stored back to back in a single array, and the ballots currently
+    counting towards each candidate are kept in a pile per candidate, so a surplus
+    transfer or exclusion only touches the ballots it moves. Ties are resolved by
+    looking back through the earlier stages of the count, and if the candidates were
+    tied at every stage, by the seeded priorities (highest priority is elected first
+    and excluded last).
+    """
+
+    def __init__(
+        self,
+        num_candidates: int,
+        seats: Optional[int] = None,
+        priorities: Optional[Sequence[int]] = None,
+    ):
+        self.num_candidates = num_candidates
+        self.seats = num_candidates if seats is None else seats
+        if self.seats > num_candidates:
+            raise ValueError("Not enough candidates to fill seats")
+
+        # Without seeded priorities, the candidate with the lowest index wins ties
+        self._priorities: Sequence[int] = (
+            priorities
+            if priorities is not None
+            else range(num_candidates, 0, -1)
+        )
+        self._preferences = array("I")
+        self._starts = array("I")  # Offset of each ballot in _preferences
+        self._ends = array("I")
+        self._counts = array("I")
+        self.empty_ballots = 0
+
+    @property
+    def ballot_count(self) -> int:
+        return sum(self._counts)
+
+    def add_ballot(self, preferences: Iterable[int], count: int = 1):
+        """
+        Adds a ballot ranking candidates by index. Unknown and repeated candidates are
+        skipped, and empty ballots do not count towards the quota.
+        """
+        start = len(self._preferences)
+        seen = set()
+        for candidate in preferences:
+            if 0 <= candidate < self.num_candidates and candidate not in seen:
+                seen.add(candidate)
+                self._preferences.append(candidate)
+
+        if len(self._preferences) == start:
+            self.empty_ballots += count
+            return
+
+        self._starts.append(start)
+        self._ends.append(len(self._preferences))
+        self._counts.append(count)
+
+    def calculate(self) -> List[int]:
+        """Returns the elected candidates in the order they were elected."""
+        n = self.num_candidates
+        self._status = [CandidateStatus.HOPEFUL] * n
+        self._votes = [0] * n
+        self._piles: List[List[int]] = [[] for _ in range(n)]
+        self._positions = array("I", self._starts)
+        self._weights = [count * VOTE_SCALE for count in self._counts]
+
+        for ballot, position in enumerate(self._positions):
+            candidate = self._preferences[position]
+            self._piles[candidate].append(ballot)
+            self._votes[candidate] += self._weights[ballot]
+
+        quota = (self.ballot_count // (self.seats + 1) + 1) * VOTE_SCALE
+        self._history = [self._votes.copy()]
+        elected: List[int] = []
+        untransferred: List[int] = []
+        standing = n
+
+        while len(elected) < self.seats:
+            winners = [
+                c
+                for c in range(n)
+                if self._status[c] == CandidateStatus.HOPEFUL
+                and self._votes[c] >= quota
+            ]
+            while winners:
+                candidate = self._select(winners, most_votes=True)
+                winners.remove(candidate)
+                self._status[candidate] = CandidateStatus.ELECTED
+                elected.append(candidate)
+                untransferred.append(candidate)
+                standing -= 1
+
+            if untransferred:
+                candidate = self._select(untransferred, most_votes=True)
+                untransferred.remove(candidate)
+                self._transfer(candidate, _transfer_value(self._votes[candidate], quota))
+
+            elif self.seats - len(elected) == standing:
+                # No competition left, the remaining candidates are elected in index order
+                for c in range(n):
+                    if self._status[c] == CandidateStatus.HOPEFUL:
+                        self._status[c] = CandidateStatus.ELECTED
+                        elected.append(c)
+                standing = 0
+
+            elif standing > 0:
+                hopeful = [
+                    c for c in range(n) if self._status[c] == CandidateStatus.HOPEFUL
+                ]
+                candidate = self._select(hopeful, most_votes=False)
+                self._status[candidate] = CandidateStatus.EXCLUDED
+                standing -= 1
+                self._transfer(candidate, TRANSFER_SCALE)
+
+            else:
+                LOGGER.warning("STV tally ended with %i seats unfilled", self.seats - len(elected))
+                break
+
+        return elected[: self.seats]
+
+    def _transfer(self, candidate: int, transfer_value: int):
+        """Moves the ballots of a candidate to their next hopeful preference."""
+        preferences = self._preferences
+        status = self._status
+        for ballot in self._piles[candidate]:
+            weight = self._weights[ballot] * transfer_value // TRANSFER_SCALE
+            self._weights[ballot] = weight
+
+            position = self._positions[ballot] + 1
+            end = self._ends[ballot]
+            while position < end and status[preferences[position]] != CandidateStatus.HOPEFUL:
+                position += 1
+            self._positions[ballot] = position
+
+            if position < end:
+                target = preferences[position]
+                self._piles[target].append(ballot)
+                self._votes[target] += weight
+
+        self._piles[candidate] = []
+        self._history.append(self._votes.copy())
+
+    def _select(self, sample: List[int], most_votes: bool) -> int:
+        """
+        Picks the candidate in the sample with the most (or least) votes. Ties are
+        resolved by the latest stage of the count where the tied candidates differ,
+        and then by priority.
+        """
+        pick = max if most_votes else min
+        best = pick(self._votes[c] for c in sample)
+        ties = [c for c in sample if self._votes[c] == best]
+
+        for stage in reversed(self._history):
+            if len(ties) == 1:
+                return ties[0]
+            best = pick(stage[c] for c in ties)
+            ties = [c for c in ties if stage[c] == best]
+
+        return pick(ties, key=self._priorities.__getitem__)
+
+
+def _transfer_value(votes: int, quota: int) -> int:
+    """(votes - quota) / votes in units of 1/TRANSFER_SCALE, rounded half to even."""
+    value, remainder = divmod((votes - quota) * TRANSFER_SCALE, votes)
+    if 2 * remainder > votes or (2 * remainder == votes and value % 2 == 1):
+        value += 1
+    return value
@@ -1,6 +1,7 @@
-from typing import List, NewType, Tuple
+from typing import NewType
 
 Key = NewType("Key", str)
 
-Ballot = NewType("Ballot", List[str])
-Result = NewType("Result", Tuple[str])
+# Ballots and results are packed member indices (see Members)
+Ballot = NewType("Ballot", bytes)
+Result = NewType("Result", bytes)
@@ -1,11 +1,18 @@
-from functools import reduce
 from hashlib import sha256
+from typing import Union
 
 
-def concat_and_hash(*args) -> str:
-    """Concats arguments to a single string and hashes it. Returns the hexdigest (a string)."""
-    src: str = reduce(lambda x, y: x + str(y), args, "")
-    return sha256(src.encode()).hexdigest()
+def hash_int(*parts: Union[bytes, str, int]) -> int:
+    """
+    SHA-256 of the concatenated parts as an integer (big-endian), for sorting and seeded
+    tie-breaks. Parts are fed to the hash one by one: bytes as they are, and anything
+    else as the UTF-8 encoding of str(part). For str and int parts, this is the same
+    digest as hashing the concatenated string.
+    """
+    digest = sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+    return int.from_bytes(digest.digest(), "big")
 
 def try_remove(l, i):
     try:
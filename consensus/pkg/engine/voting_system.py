@@ -1,13 +1,17 @@
 import logging
+import math
 import random
-from functools import reduce
-from typing import Dict, List, Tuple
-
-from stvpoll.scottish_stv import ScottishSTV
+import sys
+from typing import Dict, List, Optional, Tuple
 
+from .config import EPOCH_RETENTION
 from .consensus_node import PeerNode
+from .epoch_store import EpochStore
+from .members import Members
+from .result_tally import ResultTally, result_digest
+from .stv import STVTally
 from .types import Ballot, Key, Result
-from .utils import concat_and_hash
+from .utils import hash_int
 
 LOGGER = logging.getLogger(__name__)
 
@@ -15,110 +19,92 @@ LOGGER = logging.getLogger(__name__)
 class VotingSystem:
     """Creates ballots, receives ballots, and computes results"""
 
-    def __init__(self, key: Key, peers: List[Key], slots: int):
+    def __init__(
+        self, key: Key, peers: List[Key], slots: int, retention: int = EPOCH_RETENTION
+    ):
         self.key = key
         self.peer_keys = peers
-        self.polls: Dict[int, ScottishSTV] = {}
-        self.ballots: Dict[int, Dict[Key, Ballot]] = {}
-        self.results: Dict[int, Dict[Key, Result]] = {}
-        self.candidates: Dict[int, List[Key]] = {}
+        self.members = Members(peers)
+        # Only the latest `retention` epochs are kept
+        self.ballots: EpochStore[Dict[Key, Ballot]] = EpochStore(retention, _ballots_size)
+        self.results: EpochStore[ResultTally] = EpochStore(retention)
+        self.candidates: EpochStore[List[Key]] = EpochStore(retention)
         self.num_slots: int = slots
 
-    def fill_ballot(self, peers: Dict[str, PeerNode]) -> List[Key]:
-        """Fills a ballot based on the scores of peers and returns it"""
-        LOGGER.debug(f"ballot peers: {peers}")
-
-        population = self.peer_keys.copy()
-        weights = [peers[p].score if peers[p].online else 0.001 for p in population]
-        ballot = []
-
-        while len(population):
-            candidate = random.choices(population, weights=weights, k=1)[0]
-            ballot.append(candidate)
-            idx = population.index(candidate)
-            population.pop(idx)
-            weights.pop(idx)
+    def fill_ballot(self, peers: Dict[str, PeerNode]) -> Ballot:
+        """Fills a ballot based on the scores of peers and returns it (packed)"""
+        LOGGER.debug("ballot peers: %s", peers)
 
-        # ballot = random.sample(population, scores)
-        # ballot = random.shuffle(self.peer_keys.copy())
-        # ballot.sort(
-        #     key=lambda k: peers[k].score if peers[k].online else 0.0, reverse=True
-        # )
-        return ballot
+        weights = [peers[p].score if peers[p].online else 0.001 for p in self.peer_keys]
+        return Ballot(self.members.pack(weighted_shuffle(self.peer_keys, weights)))
 
     def add_ballot(self, epoch_number: int, key: Key, ballot: Ballot):
         """
         Stores ballots by epoch and peer
         """
-        if not epoch_number in self.ballots:
-            self.ballots[epoch_number] = {}
-
-        self.ballots[epoch_number][key] = ballot
+        self.ballots.get_or_create(epoch_number, dict)[key] = ballot
 
     def set_candidates(self, epoch_number: int, result: Result):
         """
         Sets the candidate list for an epoch.
         """
-        self.candidates[epoch_number] = list(result)
+        self.candidates[epoch_number] = self.members.unpack(result)
 
-    def get_consensus_result(self, epoch_number: int) -> Tuple[Result, int]:
+    def get_consensus_result(self, epoch_number: int) -> Tuple[Optional[Result], int]:
         """
         Returns a tuple consisting of the winning result and the count of its occurrences.
+        The result is None if only its digest has been received so far, or if no result is
+        stored for the epoch.
         """
-        results: Dict[Result, int] = {}
-        for r in self.results[epoch_number].values():
-            if results.get(r):
-                results[r] += 1
-            else:
-                results[r] = 1
-
-        result = max(results, key=results.get)
-        count = results[result]
-        return (result, count)
+        tally = self.results.get(epoch_number)
+        if tally is None:
+            return (None, 0)
+        digest, count = tally.leader
+        return (tally.result(digest), count)
 
-    def calculate_result(self, epoch_number: int) -> List[Key]:
+    def tally(self, epoch_number: int, ballots: List[Ballot]) -> Result:
         """
-        Calculates a candidate list based on received ballots for a given epoch.
+        Computes the result of the given ballots. Only reads the (immutable) member list,
+        so it is safe to call from another thread.
         """
-        self.polls[epoch_number] = ScottishSTV(
-            seats=len(self.peer_keys),
-            candidates=tuple(self.peer_keys),
-            random_in_tiebreaks=False,
+        seed = str(epoch_number).encode()
+        tally = STVTally(
+            len(self.peer_keys), priorities=[hash_int(k, seed) for k in self.peer_keys]
         )
 
-        for ballot in self.ballots[epoch_number].values():
-            self.polls[epoch_number].add_ballot(ballot)
-
-        result = self.polls[epoch_number].calculate()
-        result = list(map(lambda c: Key(str(c)), result.elected_as_tuple()))
+        for ballot in ballots:
+            tally.add_ballot(self.members.unpack_indices(ballot))
 
-        if len(result) < len(self.peer_keys):
-            # Result might not have enough candidates since the STV-library does not support seeded tie-breaks
-            result = break_ties(
-                result,
-                self.ballots[epoch_number].values(),
-                len(self.peer_keys),
-                epoch_number,
-            )
+        return Result(self.members.pack_indices(tally.calculate()))
 
-        self.set_peer_result(epoch_number, self.key, tuple(result))
-        return result
-
-    def get_candidates(self, epoch_number: int) -> Result:
+    def get_candidates(self, epoch_number: int) -> List[Key]:
         """
         Returns candidate list for a given epoch.
         Assumes the voting is done and the result has been computed.
         """
         return self.candidates.get(epoch_number)
 
-    def set_peer_result(self, epoch_number: int, peer_key: Key, result: Result):
+    def set_peer_result(
+        self,
+        epoch_number: int,
+        peer_key: Key,
+        result: Optional[Result],
+        digest: Optional[bytes] = None,
+    ):
         """
-        Stores the voting result from a peer by epoch.
+        Stores the voting result from a peer by epoch. Peers may send only the digest of
+        their result (then result is None).
         """
-        if not epoch_number in self.results:
-            self.results[epoch_number] = {}
+        if digest is None:
+            digest = result_digest(result)
+        tally = self.results.get_or_create(epoch_number, lambda: ResultTally(self.key))
+        tally.add(peer_key, digest, result)
 
-        self.results[epoch_number][peer_key] = result
+    def is_result_shared(self, epoch_number: int, result: Result) -> bool:
+        """Returns True if another peer has already broadcast the same full result."""
+        if not epoch_number in self.results:
+            return False
+        return self.results[epoch_number].is_shared(result_digest(result))
 
     def has_voted(self, key: Key, epoch_number: int) -> bool:
         """
@@ -135,12 +121,12 @@ class VotingSystem:
         the online peers.
         """
         required_amount = self.consensus_amount(online_peers)
-        return len(self.ballots[epoch_number]) >= required_amount
+        return len(self.ballots.get(epoch_number, {})) >= required_amount
 
     def has_all_ballots(self, epoch_number: int, online_peers: int):
         """Returns True if ballots have been received from all online peers."""
         has_minimum = online_peers >= self.consensus_amount(online_peers)
-        has_all = len(self.ballots[epoch_number]) >= online_peers
+        has_all = len(self.ballots.get(epoch_number, {})) >= online_peers
         return has_minimum and has_all
 
     def has_enough_similar_results(self, epoch_number: int, online_peers: int) -> bool:
@@ -148,80 +134,41 @@ class VotingSystem:
         To be able to determine that an epoch can be started, the node needs to know that at least
         2/3 of the online peers have the same result (candidates and witnesses) for the given epoch.
         """
-        if self.results[epoch_number].get(self.key) is None:
+        tally = self.results.get(epoch_number)
+        if tally is None or (own_digest := tally.digest_of(self.key)) is None:
             return False
 
         min_results = self.consensus_amount(online_peers)
-        enough_results = len(self.results[epoch_number].keys()) >= min_results
-
-        if not enough_results:
-            return False
-
-        similar_results = 0
-        own_result = self.results[epoch_number][self.key]
-
-        similar_results = reduce(
-            lambda acc, cur: acc if cur != own_result else acc + 1,
-            self.results[epoch_number].values(),
-            0,
-        )
-
-        return similar_results >= min_results
+        return tally.count(own_digest) >= min_results
 
     def consensus_amount(self, online_peers: int):
         """2/3 of the online members have to agree for a consensus to be considered met."""
         return max(self.num_slots, 1 + ((online_peers * 2) // 3))
 
-    def remove_old_epoch_data(self):
-        """Removes data for old epochs. Keeps data for 5 last epochs."""
-        if len(self.results) >= 10:
-            epochs = list(self.results.keys())
-            epochs.sort()
-            for epoch in epochs[:-5]:
-                del self.results[epoch]
-                del self.candidates[epoch]
-                del self.ballots[epoch]
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate number of bytes used by the stored epoch data."""
+        return {
+            "ballots": self.ballots.memory_usage(),
+            "results": self.results.memory_usage(),
+            "candidates": self.candidates.memory_usage(),
+        }
 
 
-def break_ties(
-    result: Result, ballots: List[Ballot], num_candidates: int, seed: int
-) -> Result:
+def weighted_shuffle(population: List[Key], weights: List[float]) -> List[Key]:
     """
-    Simple/naive tie resolution with seeded randomness. Uses a seed to randomize outcome of the
-    same tie (when the same set of candidates draw for a slot) over time.
+    Orders the population by weighted sampling without replacement, i.e. with the same
+    distribution as repeatedly drawing one element with random.choices and removing it.
+    Each element gets an exponentially distributed key with its weight as rate, and the
+    elements are sorted by key (Efraimidis-Spirakis), which takes O(n log n).
+    Elements with zero weight are placed last.
     """
-    weights = [0.5]
-
-    for i in range(1, num_candidates):
-        weights.append(weights[i - 1] / 2)
-
-    scores = {}
-
-    for ballot in ballots:
-        for i, candidate in enumerate(ballot):
-            if candidate not in result:
-                if candidate not in scores:
-                    scores[candidate] = weights[i]
-                else:
-                    scores[candidate] += weights[i]
-
-    LOGGER.debug(
-        "ballots: %i\nresult: %i\nScores: %s", len(ballots), len(result), scores
-    )
-
-    for _ in range(len(result), num_candidates):
-        max_score = max(scores.values())
-        draws = [c for c, score in scores.items() if score == max_score]
-        winner = get_slot_winner(draws, seed)
-        scores.pop(winner)
-        result.append(winner)
-
-    return result
+    keys = [
+        random.expovariate(weight) if weight > 0 else math.inf for weight in weights
+    ]
+    order = sorted(range(len(population)), key=keys.__getitem__)
+    return [population[i] for i in order]
 
 
-def get_slot_winner(candidates: List[Key], seed: int):
-    """Chooses a single element from a list randomly using a seed."""
-    if len(candidates) == 1:
-        return candidates[0]
-    keys_hashes = {k: concat_and_hash(k, seed) for k in candidates}
-    return max(keys_hashes, key=keys_hashes.get)
+def _ballots_size(ballots: Dict[Key, Ballot]) -> int:
+    # Keys are shared with the member list and not counted
+    return sys.getsizeof(ballots) + sum(sys.getsizeof(b) for b in ballots.values())
@@ -0,0 +1,51 @@
+from typing import Dict, List, Optional
+
+from .types import Key
+from .utils import hash_int
+
+
+class WitnessSchedule:
+    """
+    Witness order of an epoch with O(1) lookups: the signer of a slot and the position
+    of a key. Replacing a witness updates the index in place.
+    """
+
+    def __init__(self, witnesses: Optional[List[Key]] = None):
+        self.witnesses: List[Key] = []
+        self._index: Dict[Key, int] = {}
+        self.set_witnesses(witnesses or [])
+
+    def __len__(self) -> int:
+        return len(self.witnesses)
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def set_witnesses(self, witnesses: List[Key]):
+        """Sets the witness order."""
+        self.witnesses = list(witnesses)
+        self._index = {k: i for i, k in enumerate(self.witnesses)}
+
+    def index(self, key: Key) -> Optional[int]:
+        """Returns the position of a key in the current witness order, or None."""
+        return self._index.get(key)
+
+    def signer(self, slot: int) -> Optional[Key]:
+        """Returns the witness that signs a slot in the current round."""
+        if not self.witnesses:
+            return None
+        return self.witnesses[slot % len(self.witnesses)]
+
+    def reorder(self, seed, round_start: int):
+        """
+        Orders the witnesses by the hash of key, seed and round start (see
+        Epoch.reorder_witnesslist).
+        """
+        suffix = f"{seed}{round_start}".encode()
+        self.set_witnesses(sorted(self.witnesses, key=lambda w: hash_int(w, suffix)))
+
+    def replace(self, old: Key, new: Key):
+        """Replaces a witness (keeping its position)."""
+        idx = self._index.pop(old)
+        self.witnesses[idx] = new
+        self._index[new] = idx
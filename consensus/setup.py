@@ -9,7 +9,6 @@ setup(name='sawtooth-ddpoa-consensus',
       install_requires=[
           'requests',
           'sawtooth-sdk',
-          'protobuf == 3.20.1',
-          'STVPoll == 0.2.0'
+          'protobuf == 3.20.1'
       ],
       entry_points={})
@@ -0,0 +1,140 @@
+import random
+from types import SimpleNamespace
+
+from pkg.engine.block_cache import BlockCache
+
+
+class FakeService:
+    def __init__(self, blocks=()):
+        self.blocks = {block.block_id: block for block in blocks}
+        self.ignored = []
+
+    def ignore_block(self, block_id):
+        self.ignored.append(block_id)
+
+    def get_blocks(self, block_ids):
+        return {block_id: self.blocks[block_id] for block_id in block_ids}
+
+
+def make_block(block_id, previous_id, block_num, signer=b"\x01"):
+    return SimpleNamespace(
+        block_id=block_id,
+        previous_id=previous_id,
+        block_num=block_num,
+        signer_id=signer,
+        payload=b"",
+    )
+
+
+def make_chain(length, prefix=b"b", parent=None, start=0):
+    chain = []
+    for num in range(start, start + length):
+        previous_id = chain[-1].block_id if chain else parent or b"\x00"
+        chain.append(make_block(prefix + bytes([num]), previous_id, num))
+    return chain
+
+
+def test_fork_point_when_the_next_block_was_evicted():
+    g, b1, b2, b3 = make_chain(4)
+    cache = BlockCache(FakeService([g, b1, b2, b3]), 3)
+    for block in (b1, b3, b2, g):  # b1 is evicted
+        cache.append(block)
+
+    assert cache.fork_point(b2, g) == (g.block_id, b1.block_id)
+
+
+def fill(cache, blocks):
+    for block in blocks:
+        cache.append(block)
+    return cache
+
+
+def test_indexes_follow_evictions():
+    chain = make_chain(4)
+    fork = make_block(b"f2", chain[1].block_id, 2, signer=b"\x01")
+    service = FakeService()
+    cache = fill(BlockCache(service, 3), chain[:3] + [fork])
+
+    assert service.ignored == [chain[0].block_id]
+    assert cache.block_from_id(chain[0].block_id) is None
+    assert cache.block_from_id(fork.block_id) is fork
+    # The first block cached for a slot and signer is kept, until it is evicted
+    assert cache.block_by_num_and_signer(2, "01") is chain[2]
+    fill(cache, [chain[3], make_block(b"n4", chain[3].block_id, 4)])  # Evicts b1, b2
+    assert cache.block_by_num_and_signer(2, "01") is fork
+    assert cache.block_by_num_and_signer(0, "01") is None
+
+
+def test_stale_blocks_are_evicted_first():
+    chain = make_chain(3)
+    fork = make_block(b"f1", chain[0].block_id, 1)
+    service = FakeService()
+    cache = fill(BlockCache(service, 4), chain + [fork])
+    cache.set_head(chain[1].block_id, 1)
+
+    cache.append(make_block(b"n3", chain[2].block_id, 3))
+    assert service.ignored == [chain[0].block_id]
+    cache.append(make_block(b"n4", b"n3", 4))
+    assert service.ignored == [chain[0].block_id, fork.block_id]
+
+
+def test_pinned_blocks_are_kept_until_unpinned():
+    chain = make_chain(6)
+    service = FakeService()
+    cache = fill(BlockCache(service, 10), chain[:4])
+    cache._size = 2
+    cache.pin_chain(chain[3].block_id, chain[0].block_id)
+
+    cache.append(chain[4])
+    cache.append(chain[5])
+    assert service.ignored == [chain[4].block_id, chain[5].block_id]  # Only unpinned
+    assert all(cache.contains(block.block_id) for block in chain[:4])
+
+    cache.unpin()
+    assert [cache.contains(block.block_id) for block in chain] == [
+        False, False, True, True, False, False
+    ]
+
+
+def naive_fork_point(blocks, a, b):
+    chain_a = [a.block_id]
+    while blocks[chain_a[-1]].block_num > 0:
+        chain_a.append(blocks[chain_a[-1]].previous_id)
+    cur = b.block_id
+    while cur not in chain_a:
+        if blocks[cur].block_num == 0:
+            return (None, None)
+        cur = blocks[cur].previous_id
+    i = chain_a.index(cur)
+    return (cur, chain_a[i - 1] if i > 0 else None)
+
+
+def test_fork_point_matches_a_parent_walk():
+    rng = random.Random(7)
+    for _ in range(200):
+        genesis = [make_block(b"g", b"\x00", 0), make_block(b"h", b"\x00", 0)]
+        blocks = {block.block_id: block for block in genesis}
+        for i in range(40):
+            parent = rng.choice(list(blocks.values()))
+            block = make_block(b"n" + bytes([i]), parent.block_id, parent.block_num + 1)
+            blocks[block.block_id] = block
+
+        cache = BlockCache(FakeService(blocks.values()), rng.randint(2, 10))
+        ordered = list(blocks.values())
+        rng.shuffle(ordered)
+        fill(cache, ordered)
+
+        cached = [block for block in ordered if cache.contains(block.block_id)]
+        for _ in range(20):
+            a, b = rng.choice(cached), rng.choice(cached + ordered)
+            assert cache.fork_point(a, b) == naive_fork_point(blocks, a, b)
+
+
+def test_block_path_fetches_evicted_blocks():
+    chain = make_chain(5)
+    cache = fill(BlockCache(FakeService(chain), 2), chain)
+
+    path = cache.block_path(chain[4].block_id, chain[0].block_id)
+    assert path == [block.block_id for block in chain[1:]]
+    assert cache.traversable(chain[4].block_id, chain[3].block_id)
+    assert not cache.traversable(chain[3].block_id, chain[4].block_id)
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+from pkg.engine.bootstrap_tally import BootstrapTally
+
+
+def bootstrap(head, parent, num):
+    return SimpleNamespace(chain_head_id=head, pre_id=parent, num_blocks=num)
+
+
+def test_an_answer_supports_the_head_and_its_parent():
+    tally = BootstrapTally()
+    assert tally.add("a", bootstrap(b"h2", b"h1", 2))
+    assert tally.add("b", bootstrap(b"h1", b"h0", 1))
+
+    assert tally.leader == (b"h1", 1, 2)
+
+
+def test_ties_go_to_the_highest_block():
+    tally = BootstrapTally()
+    tally.add("a", bootstrap(b"h2", b"h1", 2))
+    assert tally.leader == (b"h2", 2, 1)
+
+
+def test_only_the_latest_answer_per_signer_counts():
+    tally = BootstrapTally()
+    tally.add("a", bootstrap(b"h1", b"h0", 1))
+    tally.add("b", bootstrap(b"h1", b"h0", 1))
+    assert not tally.add("a", bootstrap(b"h1", b"h0", 1))
+
+    tally.add("a", bootstrap(b"x2", b"x1", 2))
+    tally.add("b", bootstrap(b"x2", b"x1", 2))
+    assert tally.leader == (b"x2", 2, 2)
+    assert len(tally) == 2
+
+    tally.clear()
+    assert tally.leader is None
+    assert len(tally) == 0
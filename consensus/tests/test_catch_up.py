@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+from pkg.engine.catch_up import CatchUpPipeline
+from pkg.engine.ddpoa_engine import DDPoAEngine
+from pkg.engine.ddpoa_node import State
+
+
+class FakeService:
+    def __init__(self):
+        self.checked = []
+        self.committed = []
+
+    def check_blocks(self, block_ids):
+        self.checked.extend(block_ids)
+
+    def commit_block(self, block_id):
+        self.committed.append(block_id)
+
+    def fail_block(self, block_id):
+        raise AssertionError(f"Block {block_id} of an aborted catch-up was failed")
+
+    def get_blocks(self, block_ids):
+        raise AssertionError(f"Blocks {block_ids} of an aborted catch-up were looked up")
+
+
+class FakeNode:
+    def __init__(self):
+        self.state = State.CATCHING_UP
+        self.penalized = []
+
+    def penalize(self, key):
+        self.penalized.append(key)
+
+    downgrade = penalize
+
+
+def make_engine(window=4):
+    engine = DDPoAEngine(path_config=None, component_endpoint=None)
+    engine._service = FakeService()
+    engine._catch_up = CatchUpPipeline(engine._service, window)
+    engine._node = FakeNode()
+    engine.block_cache = SimpleNamespace(unpin=lambda: None)
+    return engine
+
+
+def test_notifications_after_abort_are_ignored():
+    engine = make_engine()
+    path = [bytes([i]) for i in range(6)]
+    engine._catch_up.start(path)
+    assert engine._service.checked == path[:4]
+
+    engine._handle_valid_block(path[0])  # Committing
+    assert engine._service.committed == [path[0]]
+
+    # A block in the middle of the window fails and aborts the catch-up
+    engine._handle_invalid_block(path[2])
+    assert engine._node.state == State.WAITING_FOR_BOOTSTRAP
+    assert not engine._catch_up.active
+
+    # The rest of the window still reports back
+    engine._node.state = State.IDLE
+    engine._handle_valid_block(path[1])
+    engine._handle_invalid_block(path[3])
+    assert engine._catch_up.on_committed(path[0])
+
+    assert engine._waiting_for_validation == 0
+    assert engine._waiting_for_commit == 0
+    assert engine._node.penalized == []
+    assert engine._node.state == State.IDLE  # Stray INVALID does not restart bootstrapping
+
+
+def test_restarted_path_counts_notifications_again():
+    service = FakeService()
+    catch_up = CatchUpPipeline(service, 2)
+    catch_up.start([b"a", b"b", b"c"])
+    catch_up.abort()
+    catch_up.start([b"a", b"b", b"c"])
+
+    assert catch_up.on_valid(b"a")
+    assert service.committed == [b"a"]
+    assert not catch_up.on_valid(b"x")
@@ -0,0 +1,43 @@
+import pytest
+
+from pkg.engine.epoch_store import EpochStore
+
+
+def test_keeps_the_latest_epochs():
+    store = EpochStore(retention=3)
+    for epoch in range(5):
+        store[epoch] = f"epoch {epoch}"
+
+    assert list(store) == [2, 3, 4]
+    assert len(store) == 3
+    assert 1 not in store
+    assert store[4] == "epoch 4"
+    assert store.get(1) is None
+    with pytest.raises(KeyError):
+        store[1]  # pylint: disable=pointless-statement
+
+
+def test_epochs_outside_the_window_are_not_stored():
+    store = EpochStore(retention=3)
+    store[5] = "new"
+    store[2] = "old"  # Same slot as epoch 5
+
+    assert 2 not in store
+    assert store[5] == "new"
+    assert store.get_or_create(2, list) == []
+    assert 2 not in store
+
+
+def test_get_or_create():
+    store = EpochStore(retention=2)
+    store.get_or_create(1, list).append("ballot")
+    store.get_or_create(1, list).append("another")
+    assert store[1] == ["ballot", "another"]
+
+
+def test_memory_usage_counts_stored_values():
+    store = EpochStore(retention=2, size_of=len)
+    store[0] = "ab"
+    store[1] = "cde"
+    store[2] = "f"  # Replaces epoch 0
+    assert store.memory_usage() == 4
@@ -0,0 +1,73 @@
+from pkg.consensus.service_pb2 import ConsensusMessage, MessageType
+from pkg.engine.inbound_queue import InboundQueue
+
+
+def message(type_, signer, epoch=0, timestamp=0):
+    return ConsensusMessage(type=type_, signer=signer, epoch=epoch, timestamp=timestamp)
+
+
+def test_messages_are_returned_by_priority():
+    queue = InboundQueue()
+    queue.put(message(MessageType.BOOTSTRAP_REQUEST, "a"))
+    queue.put(message(MessageType.VOTE, "a"))
+    queue.put(message(MessageType.EMPTY_SLOT, "b"))
+    queue.put(message(MessageType.VOTE_RESULT, "c"))
+
+    assert [m.type for m in queue.get()] == [
+        MessageType.EMPTY_SLOT,
+        MessageType.VOTE_RESULT,
+        MessageType.VOTE,
+        MessageType.BOOTSTRAP_REQUEST,
+    ]
+    assert len(queue) == 0
+
+
+def test_senders_take_turns_and_keep_their_order():
+    queue = InboundQueue()
+    for timestamp in range(3):
+        queue.put(message(MessageType.EMPTY_SLOT, "a", timestamp=timestamp))
+    queue.put(message(MessageType.EMPTY_SLOT, "b", timestamp=10))
+
+    assert [(m.signer, m.timestamp) for m in queue.get(3)] == [("a", 0), ("b", 10), ("a", 1)]
+    assert [(m.signer, m.timestamp) for m in queue.get()] == [("a", 2)]
+
+
+def test_newer_message_replaces_a_queued_one_in_place():
+    queue = InboundQueue()
+    queue.put(message(MessageType.VOTE, "a", epoch=1, timestamp=1))
+    queue.put(message(MessageType.VOTE, "b", epoch=1))
+    queue.put(message(MessageType.VOTE, "a", epoch=1, timestamp=2))
+    queue.put(message(MessageType.VOTE, "a", epoch=2))  # Another epoch is not coalesced
+
+    assert [(m.signer, m.epoch, m.timestamp) for m in queue.get()] == [
+        ("a", 1, 2),
+        ("b", 1, 0),
+        ("a", 2, 0),
+    ]
+    assert queue.suppressed == 1
+
+    # Once handled, the same key is queued again
+    queue.put(message(MessageType.VOTE, "a", epoch=1))
+    assert queue.depth == 1
+
+
+def test_empty_slots_are_never_coalesced():
+    queue = InboundQueue()
+    queue.put(message(MessageType.EMPTY_SLOT, "a"))
+    queue.put(message(MessageType.EMPTY_SLOT, "a"))
+    assert len(queue) == 2
+
+
+def test_stats():
+    queue = InboundQueue()
+    queue.put(message(MessageType.VOTE, "a", epoch=1))
+    queue.put(message(MessageType.VOTE, "b", epoch=1))
+    queue.put(message(MessageType.EMPTY_SLOT, "a"))
+    queue.get(2)
+
+    assert queue.stats() == {
+        "depth": 1,
+        "by_type": {"VOTE": 1},
+        "high_water": 3,
+        "suppressed": 0,
+    }
@@ -0,0 +1,41 @@
+import pytest
+
+from pkg.engine.members import Members
+
+
+def test_pack_round_trip():
+    members = Members(["a", "b", "c"])
+    packed = members.pack(["c", "a"])
+
+    assert packed == bytes([2, 0])
+    assert members.unpack(packed) == ["c", "a"]
+    assert members.index("b") == 1
+    assert members.key(1) == "b"
+    assert "d" not in members
+
+
+def test_large_networks_use_two_bytes_per_index():
+    members = Members(str(i) for i in range(300))
+    packed = members.pack(["299", "0"])
+
+    assert packed == (299).to_bytes(2, "little") + (0).to_bytes(2, "little")
+    assert members.unpack(packed) == ["299", "0"]
+
+
+@pytest.mark.parametrize("packed", [bytes([3]), bytes([0, 255])])
+def test_out_of_range_indices_are_invalid(packed):
+    members = Members(["a", "b", "c"])
+    assert not members.valid(packed)
+    with pytest.raises(ValueError):
+        members.unpack(packed)
+
+
+def test_odd_length_is_invalid_for_two_byte_indices():
+    members = Members(str(i) for i in range(300))
+    assert not members.valid(bytes([1, 0, 2]))
+    assert members.valid(b"")
+
+
+def test_packing_a_non_member_raises():
+    with pytest.raises(KeyError):
+        Members(["a"]).pack(["b"])
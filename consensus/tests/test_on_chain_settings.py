@@ -0,0 +1,21 @@
+import pytest
+
+from pkg.engine.ddpoa_engine import DDPoAEngine
+
+
+def setting(value):
+    return {"sawtooth.consensus.ddpoa.block_cache_size": value}
+
+
+@pytest.mark.parametrize("value", [None, "", "0", "-3", "abc", "1.5"])
+def test_invalid_size_falls_back_to_default(value):
+    assert DDPoAEngine._on_chain_size(setting(value), "block_cache_size", 7) == 7
+
+
+def test_valid_size_is_used():
+    assert DDPoAEngine._on_chain_size(setting("12"), "block_cache_size", 7) == 12
+
+
+def test_zero_epoch_retention_falls_back_to_default():
+    settings = {"sawtooth.consensus.ddpoa.epoch_retention": "0"}
+    assert DDPoAEngine._on_chain_size(settings, "epoch_retention", 5) == 5
@@ -0,0 +1,36 @@
+from pkg.consensus.service_pb2 import ConsensusMessage, MessageType
+from pkg.engine.ddpoa_engine import DDPoAEngine
+
+
+def make_engine(handle):
+    engine = DDPoAEngine(path_config=None, component_endpoint=None)
+    engine._handle_peer_msg = handle
+    engine.tallies = 0
+
+    def handle_bootstrap_tally():
+        engine.tallies += 1
+
+    engine._handle_bootstrap_tally = handle_bootstrap_tally
+    return engine
+
+
+def test_failing_message_does_not_drop_the_batch():
+    handled = []
+
+    def handle(msg):
+        if msg.type == MessageType.VOTE:
+            raise ValueError("Malformed ballot")
+        handled.append(msg.signer)
+        return msg.type == MessageType.BOOTSTRAP
+
+    engine = make_engine(handle)
+    engine._handle_peer_msgs(
+        [
+            ConsensusMessage(type=MessageType.BOOTSTRAP, signer="a"),
+            ConsensusMessage(type=MessageType.VOTE, signer="b"),
+            ConsensusMessage(type=MessageType.EMPTY_SLOT, signer="c"),
+        ]
+    )
+
+    assert handled == ["a", "c"]
+    assert engine.tallies == 1  # The tally changed before the failing message
@@ -0,0 +1,40 @@
+from pkg.engine.result_tally import ResultTally, result_digest
+
+R1, R2 = b"\x00\x01", b"\x01\x00"
+D1, D2 = result_digest(R1), result_digest(R2)
+
+
+def test_counts_the_latest_result_per_peer():
+    tally = ResultTally("own")
+    tally.add("own", D1, R1)
+    tally.add("a", D1)
+    tally.add("b", D2, R2)
+    assert tally.leader == (D1, 2)
+
+    tally.add("a", D2)  # a changed its result
+    assert (tally.count(D1), tally.count(D2)) == (1, 2)
+    assert tally.leader == (D2, 2)
+    assert len(tally) == 3
+    assert tally.digest_of("a") == D2
+
+
+def test_repeated_results_are_counted_once():
+    tally = ResultTally("own")
+    tally.add("a", D1)
+    tally.add("a", D1)
+    assert tally.leader == (D1, 1)
+
+
+def test_full_results_are_remembered_by_digest():
+    tally = ResultTally("own")
+    tally.add("own", D1, R1)
+    assert tally.result(D1) == R1
+    assert not tally.is_shared(D1)  # Only sent by ourselves
+
+    tally.add("a", D1, R1)
+    assert tally.is_shared(D1)
+    assert tally.result(D2) is None
+
+
+def test_empty_tally_has_no_leader():
+    assert ResultTally("own").leader is None
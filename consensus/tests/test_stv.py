@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from pkg.engine.stv import STVTally
+
+
+def tally(num_candidates, ballots, seats=None, priorities=None):
+    stv = STVTally(num_candidates, seats, priorities)
+    for ballot in ballots:
+        stv.add_ballot(ballot)
+    return stv.calculate()
+
+
+def test_majority_wins_a_single_seat():
+    assert tally(3, [[0], [0], [1]], seats=1) == [0]
+
+
+def test_surplus_is_transferred():
+    # Quota 3: candidate 0 has a surplus of 1, a quarter of each of its ballots moves on
+    ballots = [[0, 1]] * 4 + [[2]] + [[1]] * 2
+    assert tally(3, ballots, seats=2) == [0, 1]
+
+
+def test_weakest_candidate_is_excluded():
+    ballots = [[0]] * 2 + [[1]] * 2 + [[2, 1]]
+    assert tally(3, ballots, seats=1) == [1]
+
+
+def test_ties_are_broken_by_priority():
+    assert tally(2, [[0], [1]], seats=1) == [0]  # Lowest index by default
+    assert tally(2, [[0], [1]], seats=1, priorities=[1, 5]) == [1]
+
+
+def test_result_does_not_depend_on_ballot_order():
+    rng = random.Random(3)
+    ballots = [rng.sample(range(8), rng.randint(1, 8)) for _ in range(40)]
+    priorities = [rng.getrandbits(64) for _ in range(8)]
+    expected = tally(8, ballots, priorities=priorities)
+
+    assert sorted(expected) == list(range(8))
+    for _ in range(5):
+        rng.shuffle(ballots)
+        assert tally(8, ballots, priorities=priorities) == expected
+
+
+def test_unknown_and_repeated_candidates_are_skipped():
+    stv = STVTally(2)
+    stv.add_ballot([5, 1, 1, 0])
+    stv.add_ballot([7])
+
+    assert stv.ballot_count == 1
+    assert stv.empty_ballots == 1
+    assert stv.calculate() == [1, 0]
+
+
+def test_more_seats_than_candidates():
+    with pytest.raises(ValueError):
+        STVTally(2, seats=3)
@@ -0,0 +1,55 @@
+import time
+from types import SimpleNamespace
+
+from pkg.engine.config import ELECTION_CHECK_INTERVAL
+from pkg.engine.ddpoa_engine import DDPoAEngine
+from pkg.engine.ddpoa_node import State
+from pkg.engine.event_loop import Timers
+
+
+def test_election_timer_does_not_spin_without_a_stored_ballot():
+    engine = DDPoAEngine(path_config=None, component_endpoint=None)
+    engine._node = SimpleNamespace(
+        state=State.ELECTION,
+        should_vote=False,
+        should_rebroadcast_ballot=True,
+        previous_vote_ts=0.0,  # Not updated, the ballot is no longer in the epoch store
+        rebroadcast_ballot=lambda: None,
+    )
+
+    now = time.time()
+    engine._on_election_timer()
+
+    assert engine._timers.timeout(now, 60) >= ELECTION_CHECK_INTERVAL - 0.01
+
+
+def test_due_timers_are_popped_earliest_first():
+    timers = Timers()
+    timers.schedule("b", 20.0)
+    timers.schedule("a", 10.0)
+    timers.schedule("c", 30.0)
+
+    assert timers.timeout(5.0, 60) == 5.0
+    assert timers.pop_due(25.0) == ["a", "b"]
+    assert not timers.is_scheduled("a")
+    assert timers.is_scheduled("c")
+
+
+def test_rescheduling_replaces_the_deadline():
+    timers = Timers()
+    timers.schedule("a", 10.0)
+    timers.schedule("a", 40.0)
+    timers.schedule("b", 20.0)
+    timers.cancel("b")
+
+    assert timers.timeout(0.0, 60) == 40.0
+    assert timers.pop_due(30.0) == []
+    assert timers.pop_due(40.0) == ["a"]
+
+
+def test_timeout_is_capped_and_never_negative():
+    timers = Timers()
+    assert timers.timeout(0.0, 2.0) == 2.0
+    timers.schedule("a", 100.0)
+    assert timers.timeout(0.0, 2.0) == 2.0
+    assert timers.timeout(150.0, 2.0) == 0.0
@@ -0,0 +1,32 @@
+import random
+from collections import Counter
+
+from pkg.engine.voting_system import VotingSystem, weighted_shuffle
+
+KEYS = ["a" * 66, "b" * 66, "c" * 66]
+
+
+def test_weighted_shuffle_is_a_permutation_with_zero_weights_last():
+    random.seed(1)
+    order = weighted_shuffle(["a", "b", "c", "d"], [1.0, 0.0, 2.0, 0.5])
+    assert sorted(order) == ["a", "b", "c", "d"]
+    assert order[-1] == "b"
+
+
+def test_weighted_shuffle_favours_heavier_elements():
+    random.seed(2)
+    firsts = Counter(weighted_shuffle(["a", "b"], [3.0, 1.0])[0] for _ in range(4000))
+    assert 0.7 < firsts["a"] / 4000 < 0.8  # Expected 3/4
+
+
+def test_epochs_missing_from_the_store_have_no_ballots_or_results():
+    voting = VotingSystem(KEYS[0], KEYS, 1, retention=2)
+    for epoch in range(4):
+        voting.add_ballot(epoch, KEYS[0], b"\x00")
+
+    assert not voting.has_all_ballots(1, 1)
+    assert not voting.has_enough_ballots(1, 1)
+    assert voting.has_all_ballots(3, 1)
+    assert not voting.has_enough_similar_results(1, 1)
+    assert voting.get_consensus_result(1) == (None, 0)
+    assert not voting.has_voted(KEYS[0], 1)